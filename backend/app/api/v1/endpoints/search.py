@@ -4,7 +4,7 @@ from fastapi import APIRouter, Query, Depends
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.services.meilisearch_service import meilisearch_service
+from app.services.meilisearch_service import MeilisearchService, get_meilisearch_service
 from app.core.database import get_db
 from app.models.page import Page
 
@@ -21,6 +21,7 @@ async def search_pages(
     min_word_count: Optional[int] = Query(None, ge=0, description="Minimum word count"),
     limit: int = Query(20, ge=1, le=100, description="Number of results"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
+    meilisearch_service: MeilisearchService = Depends(get_meilisearch_service),
 ):
     """
     Search pages using full-text search.
@@ -69,7 +70,9 @@ async def search_pages(
 
 
 @router.get("/stats")
-async def get_search_stats():
+async def get_search_stats(
+    meilisearch_service: MeilisearchService = Depends(get_meilisearch_service),
+):
     """
     Get Meilisearch index statistics.
 
@@ -80,7 +83,10 @@ async def get_search_stats():
 
 
 @router.post("/reindex")
-async def reindex_all_pages(db: AsyncSession = Depends(get_db)):
+async def reindex_all_pages(
+    db: AsyncSession = Depends(get_db),
+    meilisearch_service: MeilisearchService = Depends(get_meilisearch_service),
+):
     """
     Reindex all pages from the database to Meilisearch.
 
@@ -48,6 +48,11 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
     HUGGINGFACE_API_KEY: str = ""
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 90000
+
+    # Graph analysis (PageRank runs on the GPU above this many pages when cuGraph is installed)
+    GPU_PAGERANK_THRESHOLD: int = 100000
 
     # S3 Storage
     S3_ENDPOINT: str
@@ -0,0 +1,62 @@
+"""S3-compatible object storage (MinIO) utilities."""
+
+import asyncio
+import io
+from typing import Optional
+from urllib.parse import urlparse
+from minio import Minio
+from app.core.config import settings
+
+
+# Object storage client (created on first use)
+storage_client: Optional[Minio] = None
+
+
+def get_storage_client() -> Minio:
+    """
+    Get object storage client instance, creating the bucket if needed.
+
+    Returns:
+        Minio: Storage client
+    """
+    global storage_client
+    if storage_client is None:
+        # Minio expects "host:port" without scheme
+        endpoint = urlparse(settings.S3_ENDPOINT).netloc or settings.S3_ENDPOINT
+        client = Minio(
+            endpoint,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            secure=settings.S3_SECURE,
+        )
+        if not client.bucket_exists(settings.S3_BUCKET):
+            client.make_bucket(settings.S3_BUCKET)
+        storage_client = client
+    return storage_client
+
+
+def _put_object(key: str, data: bytes, content_type: str) -> None:
+    """Upload bytes synchronously (run in a worker thread)."""
+    get_storage_client().put_object(
+        settings.S3_BUCKET,
+        key,
+        io.BytesIO(data),
+        length=len(data),
+        content_type=content_type,
+    )
+
+
+async def upload_bytes(key: str, data: bytes, content_type: str = "application/octet-stream") -> str:
+    """
+    Upload raw bytes to object storage without blocking the event loop.
+
+    Args:
+        key: Object key
+        data: Object content
+        content_type: MIME type of the content
+
+    Returns:
+        Object URL in the form s3://bucket/key
+    """
+    await asyncio.to_thread(_put_object, key, data, content_type)
+    return f"s3://{settings.S3_BUCKET}/{key}"
@@ -9,6 +9,9 @@ from prometheus_client import make_asgi_app
 from app.core.config import settings
 from app.core.database import Base, async_engine
 from app.core.redis import close_redis, get_redis
+from app.services.llm import LLMFactory
+from app.services.llm.http_client import close_http_client
+from app.services.webhook_delivery import close_http_client as close_webhook_http_client
 from app.api.v1 import api_router
 
 
@@ -39,6 +42,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("🛑 Shutting down application...")
     await close_redis()
+    LLMFactory.clear_cache()
+    await close_http_client()
+    await close_webhook_http_client()
     await async_engine.dispose()
     print("✓ Application stopped")
 
@@ -42,7 +42,7 @@ class Page(Base):
     # Content
     text_content: Mapped[str] = mapped_column(Text, nullable=True)
     rendered_html: Mapped[str] = mapped_column(Text, nullable=True)
-    content_hash: Mapped[str] = mapped_column(String(64), nullable=True)  # MD5 of text content
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=True)  # BLAKE2b-128 of text content
     word_count: Mapped[int] = mapped_column(Integer, default=0)
 
     # Link counts
@@ -1,10 +1,63 @@
 """Content generation service using LLM adapters."""
 
 from typing import Optional, Dict, Any
-from app.services.llm import LLMFactory, LLMConfig, LLMMessage
+import orjson
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+from app.core.config import settings
+from app.services.llm import (
+    LLMFactory,
+    LLMConfig,
+    LLMMessage,
+    LLMRateLimitException,
+    get_token_bucket,
+)
 from app.models.page import Page
 
 
+# System prompts per content language (English is the fallback)
+_SYSTEM_PROMPTS = {
+    "fr": (
+        "Vous êtes un expert SEO spécialisé dans la création de contenu optimisé pour les moteurs de recherche. "
+        "Vos suggestions sont concises, pertinentes et suivent les meilleures pratiques SEO actuelles. "
+        "Vous écrivez en français naturel et évitez le bourrage de mots-clés."
+    ),
+    "en": (
+        "You are an SEO expert specialized in creating search engine optimized content. "
+        "Your suggestions are concise, relevant, and follow current SEO best practices. "
+        "You write in natural English and avoid keyword stuffing."
+    ),
+}
+
+# Default model per provider
+_DEFAULT_MODELS = {
+    "openai": "gpt-3.5-turbo-1106",
+    "anthropic": "claude-3-sonnet-20240229",
+    "huggingface": "mistralai/Mistral-7B-Instruct-v0.2",
+}
+_FALLBACK_MODEL = "gpt-3.5-turbo-1106"
+
+# Page content excerpt lengths used in prompts
+EXCERPT_SHORT_LENGTH = 500
+EXCERPT_LONG_LENGTH = 1000
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+
+def _wait_for_rate_limit(retry_state: RetryCallState) -> float:
+    """Honor the provider's Retry-After hint, falling back to jittered backoff."""
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return retry_after
+    return _backoff(retry_state)
+
+
 class ContentGenerationService:
     """
     Service for generating SEO-optimized content using LLMs.
@@ -35,7 +88,48 @@ class ContentGenerationService:
 
         self.llm = LLMFactory.create(provider=provider, api_key=api_key)
         self.provider = provider
-        self.model = model
+        self.model = model or _DEFAULT_MODELS.get(provider, _FALLBACK_MODEL)
+        self.bucket = get_token_bucket(
+            provider.lower(),
+            rpm=settings.LLM_REQUESTS_PER_MINUTE,
+            tpm=settings.LLM_TOKENS_PER_MINUTE,
+        )
+
+    @retry(
+        retry=retry_if_exception_type(LLMRateLimitException),
+        wait=_wait_for_rate_limit,
+        stop=stop_after_attempt(5),
+        reraise=True,
+    )
+    async def _generate_text(
+        self,
+        prompt: str,
+        system_prompt: str,
+        config: LLMConfig,
+    ) -> str:
+        """
+        Call the LLM through the shared rate limiter.
+
+        Waits for request/token budget before each call and retries on
+        provider rate-limit errors.
+
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions
+            config: Generation configuration
+
+        Returns:
+            Generated text
+        """
+        prompt_tokens = await self.llm.count_tokens(system_prompt + prompt, model=config.model)
+        tokens_estimate = prompt_tokens + config.max_tokens
+        await self.bucket.acquire(tokens_estimate)
+
+        return await self.llm.generate_text(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            config=config,
+        )
 
     async def generate_meta_description(
         self,
@@ -55,16 +149,18 @@ class ContentGenerationService:
             Generated meta description
         """
         # Build prompt
-        system_prompt = self._get_system_prompt(language)
+        system_prompt = _SYSTEM_PROMPTS.get(language, _SYSTEM_PROMPTS["en"])
+        url, title, h1 = page.url, page.title or "N/A", page.h1 or "N/A"
+        excerpt = self._get_excerpt(page, EXCERPT_SHORT_LENGTH)
 
         user_prompt = f"""Generate a compelling meta description for this webpage.
 
-URL: {page.url}
-Title: {page.title or 'N/A'}
-H1: {page.h1 or 'N/A'}
+URL: {url}
+Title: {title}
+H1: {h1}
 
 Content excerpt:
-{page.text_content[:500] if page.text_content else 'No content'}
+{excerpt}
 
 Requirements:
 - Maximum {max_length} characters
@@ -76,12 +172,12 @@ Requirements:
 Meta description:"""
 
         config = LLMConfig(
-            model=self.model or self._get_default_model(),
+            model=self.model,
             temperature=0.7,
             max_tokens=100,
         )
 
-        description = await self.llm.generate_text(
+        description = await self._generate_text(
             prompt=user_prompt,
             system_prompt=system_prompt,
             config=config,
@@ -113,16 +209,18 @@ Meta description:"""
         Returns:
             List of title suggestions
         """
-        system_prompt = self._get_system_prompt(language)
+        system_prompt = _SYSTEM_PROMPTS.get(language, _SYSTEM_PROMPTS["en"])
+        url, title, h1 = page.url, page.title or "N/A", page.h1 or "N/A"
+        excerpt = self._get_excerpt(page, EXCERPT_SHORT_LENGTH)
 
         user_prompt = f"""Generate {count} SEO-optimized title tags for this webpage.
 
-URL: {page.url}
-Current Title: {page.title or 'N/A'}
-H1: {page.h1 or 'N/A'}
+URL: {url}
+Current Title: {title}
+H1: {h1}
 
 Content excerpt:
-{page.text_content[:500] if page.text_content else 'No content'}
+{excerpt}
 
 Requirements:
 - Maximum {max_length} characters each
@@ -134,12 +232,12 @@ Requirements:
 Provide {count} title options, one per line:"""
 
         config = LLMConfig(
-            model=self.model or self._get_default_model(),
+            model=self.model,
             temperature=0.8,  # Higher temperature for variety
             max_tokens=200,
         )
 
-        response = await self.llm.generate_text(
+        response = await self._generate_text(
             prompt=user_prompt,
             system_prompt=system_prompt,
             config=config,
@@ -171,16 +269,18 @@ Provide {count} title options, one per line:"""
         Returns:
             Suggested H1 heading
         """
-        system_prompt = self._get_system_prompt(language)
+        system_prompt = _SYSTEM_PROMPTS.get(language, _SYSTEM_PROMPTS["en"])
+        url, title, h1 = page.url, page.title or "N/A", page.h1 or "N/A"
+        excerpt = self._get_excerpt(page, EXCERPT_SHORT_LENGTH)
 
         user_prompt = f"""Generate an SEO-optimized H1 heading for this webpage.
 
-URL: {page.url}
-Title: {page.title or 'N/A'}
-Current H1: {page.h1 or 'N/A'}
+URL: {url}
+Title: {title}
+Current H1: {h1}
 
 Content excerpt:
-{page.text_content[:500] if page.text_content else 'No content'}
+{excerpt}
 
 Requirements:
 - Clear and descriptive
@@ -192,12 +292,12 @@ Requirements:
 H1 heading:"""
 
         config = LLMConfig(
-            model=self.model or self._get_default_model(),
+            model=self.model,
             temperature=0.7,
             max_tokens=50,
         )
 
-        h1 = await self.llm.generate_text(
+        h1 = await self._generate_text(
             prompt=user_prompt,
             system_prompt=system_prompt,
             config=config,
@@ -220,19 +320,22 @@ H1 heading:"""
         Returns:
             Dictionary with recommendations
         """
-        system_prompt = self._get_system_prompt(language)
+        system_prompt = _SYSTEM_PROMPTS.get(language, _SYSTEM_PROMPTS["en"])
+        url, title, h1 = page.url, page.title or "N/A", page.h1 or "N/A"
+        meta_description = page.meta_description or "N/A"
+        excerpt = self._get_excerpt(page, EXCERPT_LONG_LENGTH)
 
         user_prompt = f"""Analyze this webpage and provide SEO improvement recommendations.
 
-URL: {page.url}
-Title: {page.title or 'N/A'}
-Meta Description: {page.meta_description or 'N/A'}
-H1: {page.h1 or 'N/A'}
+URL: {url}
+Title: {title}
+Meta Description: {meta_description}
+H1: {h1}
 Word Count: {page.word_count}
 Language: {page.lang or language}
 
 Content excerpt:
-{page.text_content[:1000] if page.text_content else 'No content'}
+{excerpt}
 
 Provide recommendations for:
 1. Content quality and depth
@@ -244,22 +347,23 @@ Provide recommendations for:
 Format as JSON with keys: content_quality, keywords, structure, readability, missing_elements"""
 
         config = LLMConfig(
-            model=self.model or self._get_default_model(),
-            temperature=0.5,  # Lower temperature for consistent analysis
+            model=self.model,
+            temperature=0.0,  # Deterministic analysis, identical output on re-runs
             max_tokens=500,
+            seed=42,
+            json_mode=True,
         )
 
-        response = await self.llm.generate_text(
+        response = await self._generate_text(
             prompt=user_prompt,
             system_prompt=system_prompt,
             config=config,
         )
 
         # Try to parse as JSON, fallback to text
-        import json
         try:
-            recommendations = json.loads(response)
-        except json.JSONDecodeError:
+            recommendations = orjson.loads(response)
+        except orjson.JSONDecodeError:
             recommendations = {
                 "analysis": response,
                 "format": "text",
@@ -267,41 +371,16 @@ Format as JSON with keys: content_quality, keywords, structure, readability, mis
 
         return recommendations
 
-    def _get_system_prompt(self, language: str) -> str:
+    @staticmethod
+    def _get_excerpt(page: Page, length: int) -> str:
         """
-        Get system prompt for the LLM.
+        Get a truncated content excerpt from the page's current text.
 
         Args:
-            language: Content language
-
-        Returns:
-            System prompt text
-        """
-        if language == "fr":
-            return (
-                "Vous êtes un expert SEO spécialisé dans la création de contenu optimisé pour les moteurs de recherche. "
-                "Vos suggestions sont concises, pertinentes et suivent les meilleures pratiques SEO actuelles. "
-                "Vous écrivez en français naturel et évitez le bourrage de mots-clés."
-            )
-        else:
-            return (
-                "You are an SEO expert specialized in creating search engine optimized content. "
-                "Your suggestions are concise, relevant, and follow current SEO best practices. "
-                "You write in natural English and avoid keyword stuffing."
-            )
-
-    def _get_default_model(self) -> str:
-        """
-        Get default model for the provider.
+            page: Page object
+            length: Maximum excerpt length
 
         Returns:
-            Model name
+            Content excerpt or placeholder when the page has no content
         """
-        if self.provider == "openai":
-            return "gpt-3.5-turbo-1106"
-        elif self.provider == "anthropic":
-            return "claude-3-sonnet-20240229"
-        elif self.provider == "huggingface":
-            return "mistralai/Mistral-7B-Instruct-v0.2"
-        else:
-            return "gpt-3.5-turbo-1106"  # Fallback
+        return page.text_content[:length] if page.text_content else "No content"
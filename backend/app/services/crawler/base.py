@@ -1,12 +1,48 @@
 """Base crawler interface."""
 
+import asyncio
+import hashlib
+import itertools
+import re
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass
 from datetime import datetime
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 
+from app.services.nlp.language import detect_language
 
-@dataclass
+
+# CSS selectors used when extracting SEO fields (selectolax caches compiled selectors)
+TITLE_SELECTOR = "title"
+META_DESCRIPTION_SELECTOR = 'meta[name="description"]'
+META_KEYWORDS_SELECTOR = 'meta[name="keywords"]'
+H1_SELECTOR = "h1"
+HTML_SELECTOR = "html"
+CANONICAL_SELECTOR = 'link[rel~="canonical"]'
+HREFLANG_SELECTOR = 'link[rel~="alternate"][hreflang]'
+LINK_SELECTOR = "a[href]"
+NON_TEXT_SELECTOR = "script, style"
+
+# Maximum number of characters of HTML stored per page
+MAX_RENDERED_HTML_LENGTH = 10000
+
+# File extensions of non-HTML resources that are never crawled
+SKIP_EXTENSIONS = frozenset({"pdf", "jpg", "jpeg", "png", "gif", "css", "js", "xml", "zip"})
+
+# Whitespace-delimited words, counted without building a list
+WORD_PATTERN = re.compile(r"\S+")
+
+# URLs matching these patterns (pagination, facets, sorting) are scheduled last
+LOW_PRIORITY_URL_PATTERN = re.compile(
+    r"[?&](?:page|p|sort|order|filter|limit|offset)=|/page/\d+", re.IGNORECASE
+)
+
+
+@dataclass(slots=True)
 class CrawledPage:
     """Data class for crawled page information."""
 
@@ -29,7 +65,7 @@ class CrawledPage:
     outgoing_links: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class CrawlResult:
     """Result of a crawl operation."""
 
@@ -63,6 +99,18 @@ class BaseCrawler(ABC):
         self.delay = config.get("delay", 1.0)
         self.respect_robots = config.get("respect_robots", True)
         self.user_agent = config.get("user_agent", "SEO-SaaS-Bot/1.0")
+        self.flush_batch_size = config.get("flush_batch", 50)
+        self.max_links_per_page = config.get("max_links_per_page", 200)
+        self.per_host = config.get("per_host", 8)
+        # Politeness: requests per second per host (defaults to one request every `delay` seconds)
+        self.rps_per_host = config.get("rps_per_host", 1.0 / self.delay if self.delay > 0 else 0)
+        self._host_next_request: Dict[str, float] = {}
+        self._robots: Dict[str, Optional[RobotFileParser]] = {}
+        self._robots_lock: Optional[asyncio.Lock] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._enqueued: Set[bytes] = set()  # Fingerprints of URLs queued this crawl (sole dedup set)
+        self._queue_counter = itertools.count()  # Tie-breaker keeping FIFO order within a priority
+        self._pending_pages: List[CrawledPage] = []
 
     @abstractmethod
     async def crawl(self) -> CrawlResult:
@@ -82,6 +130,227 @@ class BaseCrawler(ABC):
         """Stop the crawler gracefully."""
         pass
 
+    async def close(self) -> None:
+        """Release resources held across crawls (sessions, connection pools)."""
+        pass
+
+    def _reset_crawl_state(self) -> None:
+        """Clear the queue and politeness state left over from a previous crawl."""
+        self._host_next_request.clear()
+        self._enqueued.clear()
+        self._queue_counter = itertools.count()
+        self._pending_pages = []
+
+    @abstractmethod
+    async def _crawl_url(self, url: str, depth: int, queue: asyncio.PriorityQueue) -> None:
+        """
+        Crawl a single URL and enqueue its outgoing links.
+
+        Args:
+            url: URL to crawl
+            depth: Current depth
+            queue: Crawl queue receiving discovered links
+        """
+        pass
+
+    async def _run_queue(self, workers: int) -> None:
+        """
+        Crawl from the start URL with workers sharing one priority queue.
+
+        Shallow pages are crawled first. Returns once the queue is drained,
+        after flushing pending pages.
+
+        Args:
+            workers: Number of concurrent workers
+        """
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._enqueue(queue, self.start_url, 0)
+
+        tasks = [asyncio.create_task(self._worker(queue)) for _ in range(workers)]
+        try:
+            await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._flush_pages()
+
+    def _enqueue(self, queue: asyncio.PriorityQueue, url: str, depth: int) -> None:
+        """
+        Schedule a URL, prioritized by depth then URL score.
+
+        Each URL is queued at most once per crawl, so pages linked from every
+        template (navigation, footer) do not pile up duplicate queue entries.
+        This fingerprint set is the only URL dedup structure: crawlers do not
+        keep a second set of visited URL strings.
+
+        Args:
+            queue: Crawl queue
+            url: URL to schedule
+            depth: Crawl depth of the URL
+        """
+        fingerprint = self._url_fingerprint(url)
+        if fingerprint in self._enqueued:
+            return
+        self._enqueued.add(fingerprint)
+
+        queue.put_nowait((depth, self._score_url(url), next(self._queue_counter), url))
+
+    async def _worker(self, queue: asyncio.PriorityQueue) -> None:
+        """
+        Consume queued URLs, lowest depth first, until cancelled.
+
+        Args:
+            queue: Shared crawl queue
+        """
+        while True:
+            depth, _, _, url = await queue.get()
+            try:
+                if await self._is_allowed(url):
+                    await self._crawl_url(url, depth, queue)
+            finally:
+                queue.task_done()
+
+    async def _throttle(self, url: str) -> None:
+        """
+        Wait for the next request slot of the URL's host.
+
+        Slots are spaced by 1 / rps_per_host seconds, or by the robots.txt
+        Crawl-delay when it is longer. Other hosts are not affected.
+
+        Args:
+            url: URL about to be fetched
+        """
+        host = urlparse(url).netloc
+        interval = 1.0 / self.rps_per_host if self.rps_per_host > 0 else 0.0
+
+        robots = self._robots.get(host)
+        if robots is not None:
+            crawl_delay = robots.crawl_delay(self.user_agent)
+            if crawl_delay:
+                interval = max(interval, float(crawl_delay))
+
+        if interval <= 0:
+            return
+
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._host_next_request.get(host, now))
+        self._host_next_request[host] = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _host_slots(self, url: str) -> asyncio.Semaphore:
+        """
+        Get the semaphore limiting concurrent requests to the URL's host.
+
+        Args:
+            url: URL about to be fetched
+
+        Returns:
+            Semaphore allowing per_host requests in flight for that host
+        """
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+    async def _is_allowed(self, url: str) -> bool:
+        """
+        Check robots.txt rules for a URL (fetched once per host).
+
+        Args:
+            url: URL to check
+
+        Returns:
+            True if the URL may be crawled
+        """
+        if not self.respect_robots:
+            return True
+
+        parsed = urlparse(url)
+        host = parsed.netloc
+        if host not in self._robots:
+            if self._robots_lock is None:
+                self._robots_lock = asyncio.Lock()
+            async with self._robots_lock:
+                if host not in self._robots:
+                    self._robots[host] = await self._load_robots(f"{parsed.scheme}://{host}/robots.txt")
+
+        robots = self._robots[host]
+        return robots is None or robots.can_fetch(self.user_agent, url)
+
+    async def _load_robots(self, robots_url: str) -> Optional[RobotFileParser]:
+        """
+        Download and parse a robots.txt file.
+
+        Args:
+            robots_url: robots.txt URL
+
+        Returns:
+            Parsed rules, or None when unavailable (everything is allowed)
+        """
+        try:
+            body = await self._fetch_robots_txt(robots_url)
+        except Exception:
+            return None
+
+        if body is None:
+            return None
+
+        robots = RobotFileParser(robots_url)
+        robots.parse(body.splitlines())
+        return robots
+
+    async def _fetch_robots_txt(self, robots_url: str) -> Optional[str]:
+        """
+        Fetch robots.txt content.
+
+        Args:
+            robots_url: robots.txt URL
+
+        Returns:
+            File content, or None if it does not exist
+        """
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers={"User-Agent": self.user_agent},
+        ) as session:
+            async with session.get(robots_url) as response:
+                if response.status >= 400:
+                    return None
+                return await response.text()
+
+    async def _persist(self, pages: List[CrawledPage]) -> None:
+        """
+        Persist a batch of crawled pages.
+
+        No-op by default; override to write pages in bulk (e.g. a single
+        INSERT) while the crawl is still running.
+
+        Args:
+            pages: Pages crawled since the previous flush
+        """
+        pass
+
+    async def _buffer_page(self, page: CrawledPage) -> None:
+        """
+        Add a crawled page to the pending batch, flushing it when full.
+
+        Args:
+            page: Crawled page
+        """
+        self._pending_pages.append(page)
+        if len(self._pending_pages) >= self.flush_batch_size:
+            await self._flush_pages()
+
+    async def _flush_pages(self) -> None:
+        """Persist and clear the pending batch of crawled pages."""
+        if self._pending_pages:
+            batch = self._pending_pages
+            self._pending_pages = []
+            await self._persist(batch)
+
     def _should_crawl_url(self, url: str) -> bool:
         """
         Check if URL should be crawled.
@@ -96,13 +365,148 @@ class BaseCrawler(ABC):
         if not url:
             return False
 
-        # Skip common non-HTML resources
-        skip_extensions = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.css', '.js', '.xml', '.zip')
-        if any(url.lower().endswith(ext) for ext in skip_extensions):
+        # Skip common non-HTML resources (only the extension is lowercased)
+        path = url.split("#", 1)[0].split("?", 1)[0]
+        last_segment = path.rpartition("/")[2]
+        if "." in last_segment and last_segment.rpartition(".")[2].lower() in SKIP_EXTENSIONS:
             return False
 
         return True
 
+    def _score_url(self, url: str) -> int:
+        """
+        Score a URL for crawl scheduling (lower is crawled first).
+
+        Args:
+            url: URL to score
+
+        Returns:
+            0 for regular pages, 1 for pagination/faceted URLs
+        """
+        return 1 if LOW_PRIORITY_URL_PATTERN.search(url) else 0
+
+    def _url_fingerprint(self, url: str) -> bytes:
+        """
+        Compact fixed-size key for URL deduplication.
+
+        Args:
+            url: URL to fingerprint
+
+        Returns:
+            16-byte BLAKE2b digest of the URL
+        """
+        return hashlib.blake2b(url.encode(), digest_size=16).digest()
+
+    def _extract_page_data(self, url: str, html: str) -> Dict[str, Any]:
+        """
+        Parse HTML and extract SEO information shared by all crawlers.
+
+        Uses selectolax's Lexbor parser, which is much faster than
+        BeautifulSoup for the simple lookups needed here. Every attribute is
+        read from the unmodified tree before text extraction strips it.
+
+        Args:
+            url: Page URL
+            html: HTML content
+
+        Returns:
+            Dictionary of extracted CrawledPage fields
+        """
+        tree = LexborHTMLParser(html)
+
+        # Extract title
+        title_tag = tree.css_first(TITLE_SELECTOR)
+        title = title_tag.text(strip=True) if title_tag else None
+
+        # Extract meta description
+        meta_desc = tree.css_first(META_DESCRIPTION_SELECTOR)
+        meta_description = meta_desc.attributes.get("content") if meta_desc else None
+
+        # Extract meta keywords
+        meta_kw = tree.css_first(META_KEYWORDS_SELECTOR)
+        meta_keywords = meta_kw.attributes.get("content") if meta_kw else None
+
+        # Extract H1
+        h1_tag = tree.css_first(H1_SELECTOR)
+        h1 = h1_tag.text(strip=True) if h1_tag else None
+
+        # Extract lang from HTML attribute
+        html_tag = tree.css_first(HTML_SELECTOR)
+        lang_from_html = html_tag.attributes.get("lang") if html_tag else None
+
+        # Extract canonical
+        canonical_tag = tree.css_first(CANONICAL_SELECTOR)
+        canonical_url = canonical_tag.attributes.get("href") if canonical_tag else None
+
+        # Extract hreflang
+        hreflang_tags = tree.css(HREFLANG_SELECTOR)
+        hreflang = (
+            {tag.attributes.get("hreflang"): tag.attributes.get("href") for tag in hreflang_tags}
+            if hreflang_tags
+            else None
+        )
+
+        # Extract outgoing links
+        outgoing_links = []
+        base_domain = urlparse(url).netloc
+
+        for link in tree.css(LINK_SELECTOR):
+            href = link.attributes.get("href")
+            if not href:
+                continue
+
+            # Resolve relative URLs
+            absolute_url = urljoin(url, href)
+            parsed = urlparse(absolute_url)
+
+            # Only internal links
+            if parsed.netloc == base_domain:
+                outgoing_links.append(absolute_url)
+                if len(outgoing_links) >= self.max_links_per_page:
+                    break
+
+        # Extract text content last: removing script and style elements
+        # mutates the tree, which is released right after
+        for node in tree.css(NON_TEXT_SELECTOR):
+            node.decompose()
+        # Whole document, head included, skipping blank text nodes for
+        # parity with BeautifulSoup get_text(separator=" ", strip=True)
+        text_content = " ".join(
+            text
+            for node in (tree.root.traverse(include_text=True) if tree.root else ())
+            if node.tag == "-text" and (text := node.text_content.strip())
+        )
+        del tree
+        word_count = sum(1 for _ in WORD_PATTERN.finditer(text_content))
+
+        # Auto-detect language from content if not specified or too generic
+        if not lang_from_html or len(lang_from_html) > 5:
+            detected = detect_language(text_content)
+            lang = detected if detected else lang_from_html
+        else:
+            # Clean HTML lang (e.g., "en-US" → "en")
+            lang = lang_from_html.split("-")[0]
+
+        # Generate hashes
+        # url_hash stays SHA-256: it is the persisted lookup key for existing pages
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        content_hash = hashlib.blake2b(text_content.encode(), digest_size=16).hexdigest()
+
+        return {
+            "url_hash": url_hash,
+            "title": title,
+            "meta_description": meta_description,
+            "meta_keywords": meta_keywords,
+            "h1": h1,
+            "text_content": text_content,
+            "content_hash": content_hash,
+            "word_count": word_count,
+            "lang": lang,
+            "canonical_url": canonical_url,
+            "hreflang": hreflang,
+            "outgoing_links": outgoing_links,
+        }
+
 
 class CrawlerException(Exception):
     """Base exception for crawler errors."""
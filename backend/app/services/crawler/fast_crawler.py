@@ -1,32 +1,43 @@
-"""Fast crawler using requests and BeautifulSoup with language detection."""
+"""Fast crawler using aiohttp and selectolax with language detection."""
 
 import asyncio
-import hashlib
 from datetime import datetime
-from typing import List, Dict, Any, Set
-from urllib.parse import urljoin, urlparse
+from typing import List, Dict, Any, Optional
 import aiohttp
-from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from app.services.crawler.base import BaseCrawler, CrawledPage, CrawlResult, CrawlerException
-from app.services.nlp.language import detect_language
+from app.services.crawler.base import (
+    BaseCrawler,
+    CrawledPage,
+    CrawlResult,
+    CrawlerException,
+    MAX_RENDERED_HTML_LENGTH,
+)
 
 
 class FastCrawler(BaseCrawler):
     """
-    Fast crawler for static HTML sites using aiohttp and BeautifulSoup.
+    Fast crawler for static HTML sites using aiohttp and selectolax.
 
     Does not execute JavaScript - suitable for static sites only.
     """
 
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize fast crawler."""
+    def __init__(self, config: Dict[str, Any], session: Optional[aiohttp.ClientSession] = None):
+        """
+        Initialize fast crawler.
+
+        Args:
+            config: Crawler configuration dictionary
+            session: Optional shared aiohttp session (the caller keeps ownership)
+        """
         super().__init__(config)
-        self.visited_urls: Set[str] = set()
+        self.visited_count = 0  # URLs taken off the queue (dedup is done when enqueuing)
         self.pages: List[CrawledPage] = []
         self.errors: List[Dict[str, Any]] = []
-        self.session: aiohttp.ClientSession | None = None
+        self.max_concurrency = config.get("max_concurrency", 50)
+        self.workers = config.get("workers", 20)
+        self.session: aiohttp.ClientSession | None = session
+        self._owns_session = session is None
         self._should_stop = False
 
     async def crawl(self) -> CrawlResult:
@@ -38,22 +49,27 @@ class FastCrawler(BaseCrawler):
         """
         started_at = datetime.utcnow()
 
+        # Only the session is shared between crawls; results start empty
+        self._reset_crawl_state()
+        self.visited_count = 0
+        self.pages = []
+        self.errors = []
+        self._should_stop = False
+
         try:
-            # Create aiohttp session
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(
-                timeout=timeout,
-                headers={"User-Agent": self.user_agent},
-            )
+            # Reuse the session across crawls (created lazily on first use)
+            if self.session is None or self.session.closed:
+                self.session = self._create_session()
+                self._owns_session = True
 
-            # Start crawling from start URL
-            await self._crawl_url(self.start_url, depth=0)
+            # Crawl with a pool of workers sharing one priority queue
+            await self._run_queue(self.workers)
 
             finished_at = datetime.utcnow()
 
             return CrawlResult(
                 pages=self.pages,
-                total_discovered=len(self.visited_urls),
+                total_discovered=self.visited_count,
                 total_crawled=len(self.pages),
                 total_failed=len(self.errors),
                 errors=self.errors,
@@ -64,15 +80,51 @@ class FastCrawler(BaseCrawler):
         except Exception as e:
             raise CrawlerException(f"Crawl failed: {str(e)}") from e
 
-        finally:
-            if self.session:
-                await self.session.close()
-
     async def stop(self) -> None:
         """Stop the crawler gracefully."""
         self._should_stop = True
-        if self.session:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP session if it is owned by this crawler."""
+        if self.session and self._owns_session:
             await self.session.close()
+        self.session = None
+
+    async def _fetch_robots_txt(self, robots_url: str) -> Optional[str]:
+        """
+        Fetch robots.txt content with the crawl session.
+
+        Args:
+            robots_url: robots.txt URL
+
+        Returns:
+            File content, or None if it does not exist
+        """
+        async with self.session.get(robots_url) as response:
+            if response.status >= 400:
+                return None
+            return await response.text()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """
+        Create an aiohttp session with a tuned connection pool.
+
+        Returns:
+            aiohttp.ClientSession
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.per_host,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+            enable_cleanup_closed=True,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"User-Agent": self.user_agent},
+        )
 
     @retry(
         stop=stop_after_attempt(3),
@@ -81,7 +133,7 @@ class FastCrawler(BaseCrawler):
     )
     async def _fetch_page(self, url: str) -> tuple[int, str, str]:
         """
-        Fetch a page with retries.
+        Fetch a page with retries, each attempt waiting for a per-host slot.
 
         Args:
             url: URL to fetch
@@ -92,18 +144,23 @@ class FastCrawler(BaseCrawler):
         if not self.session:
             raise CrawlerException("Session not initialized")
 
-        async with self.session.get(url) as response:
-            content_type = response.headers.get("Content-Type", "")
-            html = await response.text()
-            return response.status, content_type, html
+        # Wait for this host's next request slot (on every attempt, retries included)
+        await self._throttle(url)
 
-    async def _crawl_url(self, url: str, depth: int) -> None:
+        async with self._host_slots(url):
+            async with self.session.get(url) as response:
+                content_type = response.headers.get("Content-Type", "")
+                html = await response.text()
+                return response.status, content_type, html
+
+    async def _crawl_url(self, url: str, depth: int, queue: asyncio.PriorityQueue) -> None:
         """
-        Crawl a single URL.
+        Crawl a single URL and enqueue its outgoing links.
 
         Args:
             url: URL to crawl
             depth: Current depth
+            queue: Crawl queue receiving discovered links
         """
         # Check stopping conditions
         if self._should_stop:
@@ -112,21 +169,15 @@ class FastCrawler(BaseCrawler):
         if depth > self.max_depth:
             return
 
-        if len(self.pages) >= self.max_pages:
-            return
-
-        if url in self.visited_urls:
+        # Count in-flight URLs too, so concurrent workers cannot overshoot max_pages
+        if self.visited_count >= self.max_pages:
             return
 
         if not self._should_crawl_url(url):
             return
 
         # Mark as visited
-        self.visited_urls.add(url)
-
-        # Apply delay
-        if self.delay > 0 and len(self.pages) > 0:
-            await asyncio.sleep(self.delay)
+        self.visited_count += 1
 
         try:
             # Fetch page
@@ -135,17 +186,14 @@ class FastCrawler(BaseCrawler):
             # Parse page
             page = await self._parse_page(url, status_code, content_type, html, depth)
             self.pages.append(page)
+            await self._buffer_page(page)
 
-            # Crawl outgoing links
+            # Enqueue outgoing links
             if depth < self.max_depth:
-                tasks = []
                 for link_url in page.outgoing_links:
-                    if len(self.pages) < self.max_pages:
-                        tasks.append(self._crawl_url(link_url, depth + 1))
-
-                # Crawl links concurrently (limited)
-                if tasks:
-                    await asyncio.gather(*tasks[:10])  # Limit concurrent requests
+                    if self.visited_count >= self.max_pages:
+                        break
+                    self._enqueue(queue, link_url, depth + 1)
 
         except Exception as e:
             self.errors.append(
@@ -153,7 +201,7 @@ class FastCrawler(BaseCrawler):
                     "url": url,
                     "depth": depth,
                     "error": str(e),
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": datetime.utcnow(),  # Serialized only if the errors are exported
                 }
             )
 
@@ -173,89 +221,13 @@ class FastCrawler(BaseCrawler):
         Returns:
             CrawledPage object
         """
-        soup = BeautifulSoup(html, "lxml")
-
-        # Extract title
-        title_tag = soup.find("title")
-        title = title_tag.get_text(strip=True) if title_tag else None
-
-        # Extract meta description
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        meta_description = meta_desc.get("content") if meta_desc else None
-
-        # Extract meta keywords
-        meta_kw = soup.find("meta", attrs={"name": "keywords"})
-        meta_keywords = meta_kw.get("content") if meta_kw else None
-
-        # Extract H1
-        h1_tag = soup.find("h1")
-        h1 = h1_tag.get_text(strip=True) if h1_tag else None
-
-        # Extract text content
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        text_content = soup.get_text(separator=" ", strip=True)
-        word_count = len(text_content.split())
-
-        # Extract lang from HTML attribute
-        html_tag = soup.find("html")
-        lang_from_html = html_tag.get("lang") if html_tag else None
-
-        # Auto-detect language from content if not specified or too generic
-        if not lang_from_html or len(lang_from_html) > 5:
-            # HTML lang attribute is missing or too generic (e.g., "en-US" → use "en")
-            detected = detect_language(text_content)
-            lang = detected if detected else lang_from_html
-        else:
-            # Clean HTML lang (e.g., "en-US" → "en")
-            lang = lang_from_html.split("-")[0] if lang_from_html else None
-
-        # Extract canonical
-        canonical_tag = soup.find("link", attrs={"rel": "canonical"})
-        canonical_url = canonical_tag.get("href") if canonical_tag else None
-
-        # Extract hreflang
-        hreflang_tags = soup.find_all("link", attrs={"rel": "alternate", "hreflang": True})
-        hreflang = {tag.get("hreflang"): tag.get("href") for tag in hreflang_tags} if hreflang_tags else None
-
-        # Extract outgoing links
-        outgoing_links = []
-        base_domain = urlparse(url).netloc
-
-        for link in soup.find_all("a", href=True):
-            href = link.get("href")
-            if not href:
-                continue
-
-            # Resolve relative URLs
-            absolute_url = urljoin(url, href)
-            parsed = urlparse(absolute_url)
-
-            # Only internal links
-            if parsed.netloc == base_domain:
-                outgoing_links.append(absolute_url)
-
-        # Generate hashes
-        url_hash = hashlib.sha256(url.encode()).hexdigest()
-        content_hash = hashlib.md5(text_content.encode()).hexdigest()
+        data = self._extract_page_data(url, html)
 
         return CrawledPage(
             url=url,
-            url_hash=url_hash,
             status_code=status_code,
             content_type=content_type,
-            title=title,
-            meta_description=meta_description,
-            meta_keywords=meta_keywords,
-            h1=h1,
-            text_content=text_content,
-            rendered_html=html[:10000] if len(html) <= 10000 else None,  # Limit stored HTML
-            content_hash=content_hash,
-            word_count=word_count,
-            lang=lang,
-            canonical_url=canonical_url,
-            hreflang=hreflang,
+            rendered_html=html[:MAX_RENDERED_HTML_LENGTH],  # Limit stored HTML
             depth=depth,
-            outgoing_links=outgoing_links,
+            **data,
         )
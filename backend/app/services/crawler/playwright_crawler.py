@@ -1,17 +1,35 @@
 """Playwright crawler for JavaScript-heavy sites with screenshot support."""
 
 import asyncio
-import hashlib
-import base64
 from datetime import datetime
-from typing import List, Dict, Any, Set, Optional
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Error as PlaywrightError
+from typing import List, Dict, Any, Optional
+from playwright.async_api import (
+    async_playwright,
+    Page,
+    Browser,
+    BrowserContext,
+    Route,
+    Error as PlaywrightError,
+)
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from app.services.crawler.base import BaseCrawler, CrawledPage, CrawlResult, CrawlerException
-from app.services.nlp.language import detect_language
+from app.core.storage import upload_bytes
+from app.services.crawler.base import (
+    BaseCrawler,
+    CrawledPage,
+    CrawlResult,
+    CrawlerException,
+    MAX_RENDERED_HTML_LENGTH,
+)
+
+
+# File extensions identifying blocked resource types straight from the request URL
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "svg", "ico"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "mp3", "ogg", "wav"),
+    "stylesheet": ("css",),
+}
 
 
 class PlaywrightCrawler(BaseCrawler):
@@ -24,26 +42,38 @@ class PlaywrightCrawler(BaseCrawler):
     - Detects JavaScript errors
     - Supports custom viewport sizes
     - Mobile/Desktop user agent switching
+    - Parallel workers, each with its own browser context
     """
 
     def __init__(self, config: Dict[str, Any]):
         """Initialize Playwright crawler."""
         super().__init__(config)
-        self.visited_urls: Set[str] = set()
+        self.visited_count = 0  # URLs taken off the queue (dedup is done when enqueuing)
         self.pages: List[CrawledPage] = []
         self.errors: List[Dict[str, Any]] = []
         self._should_stop = False
 
         # Playwright specific config
         self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
+        self.contexts: List[BrowserContext] = []
         self.headless = config.get("headless", True)
         self.capture_screenshot = config.get("capture_screenshot", False)
         self.screenshot_type = config.get("screenshot_type", "viewport")  # viewport or fullpage
         self.viewport = config.get("viewport", {"width": 1920, "height": 1080})
         self.wait_until = config.get("wait_until", "networkidle")  # load, domcontentloaded, networkidle
         self.timeout = config.get("timeout", 30000)  # 30 seconds
+        self.render_timeout = config.get("render_timeout", 2000)  # Max wait for JS rendering
         self.block_resources = config.get("block_resources", ["image", "font", "media"])  # Optimize speed
+        self._blocked_types = frozenset(self.block_resources)
+        self._blocked_extensions = frozenset(
+            ext for resource_type in self._blocked_types
+            for ext in RESOURCE_TYPE_EXTENSIONS.get(resource_type, ())
+        )
+        self.browser_workers = config.get("browser_workers", 4)
+
+        # Warm pages reused across URLs instead of opening one page per URL
+        self._page_pool: Optional[asyncio.Queue] = None
+        self._console_messages: Dict[int, List[str]] = {}
 
         # JavaScript error tracking
         self.js_errors: Dict[str, List[str]] = {}
@@ -57,41 +87,36 @@ class PlaywrightCrawler(BaseCrawler):
         """
         started_at = datetime.utcnow()
 
+        self._reset_crawl_state()
+        self.visited_count = 0
+        self.pages = []
+        self.errors = []
+        self._should_stop = False
+        self.js_errors = {}
+
         try:
             # Launch Playwright
             async with async_playwright() as p:
                 # Launch browser
                 self.browser = await p.chromium.launch(headless=self.headless)
 
-                # Create context with configuration
-                self.context = await self.browser.new_context(
-                    viewport=self.viewport,
-                    user_agent=self.user_agent,
-                )
-
-                # Block resources to improve performance
-                if self.block_resources:
-                    await self.context.route(
-                        "**/*",
-                        lambda route: (
-                            route.abort()
-                            if route.request.resource_type in self.block_resources
-                            else route.continue_()
-                        ),
-                    )
+                # One isolated context and warm page per worker
+                self._page_pool = asyncio.Queue()
+                for _ in range(self.browser_workers):
+                    context = await self._new_context()
+                    self._page_pool.put_nowait(await self._new_page(context))
 
-                # Start crawling
-                await self._crawl_url(self.start_url, depth=0)
+                # Crawl with parallel workers sharing one priority queue
+                await self._run_queue(self.browser_workers)
 
                 # Close browser
-                await self.context.close()
-                await self.browser.close()
+                await self._close_browser()
 
             finished_at = datetime.utcnow()
 
             return CrawlResult(
                 pages=self.pages,
-                total_discovered=len(self.visited_urls),
+                total_discovered=self.visited_count,
                 total_crawled=len(self.pages),
                 total_failed=len(self.errors),
                 errors=self.errors,
@@ -103,41 +128,73 @@ class PlaywrightCrawler(BaseCrawler):
             raise CrawlerException(f"Playwright crawl failed: {str(e)}") from e
 
         finally:
-            if self.context:
-                await self.context.close()
-            if self.browser:
-                await self.browser.close()
+            await self._close_browser()
 
     async def stop(self) -> None:
         """Stop the crawler gracefully."""
         self._should_stop = True
-        if self.context:
-            await self.context.close()
+        await self._close_browser()
+
+    async def _close_browser(self) -> None:
+        """Close all browser contexts and the browser."""
+        contexts, self.contexts = self.contexts, []
+        for context in contexts:
+            await context.close()
         if self.browser:
-            await self.browser.close()
+            browser, self.browser = self.browser, None
+            await browser.close()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True,
-    )
-    async def _fetch_page(self, url: str) -> tuple[Page, int, str]:
+    async def _new_context(self) -> BrowserContext:
         """
-        Fetch a page with Playwright and retries.
+        Create a browser context with configuration and resource blocking.
+
+        Returns:
+            Playwright browser context
+        """
+        if not self.browser:
+            raise CrawlerException("Browser not initialized")
+
+        context = await self.browser.new_context(
+            viewport=self.viewport,
+            user_agent=self.user_agent,
+        )
+
+        # Block resources to improve performance
+        if self._blocked_types:
+            await context.route("**/*", self._route_request)
+
+        self.contexts.append(context)
+        return context
+
+    async def _route_request(self, route: Route) -> None:
+        """
+        Abort requests for blocked resource types, continue the others.
 
         Args:
-            url: URL to fetch
+            route: Intercepted Playwright route
+        """
+        request = route.request
+        extension = request.url.split("?", 1)[0].rpartition(".")[2].lower()
+        if extension in self._blocked_extensions or request.resource_type in self._blocked_types:
+            await route.abort()
+        else:
+            await route.continue_()
 
-        Returns:
-            Tuple of (page, status_code, html)
+    async def _new_page(self, context: BrowserContext) -> Page:
         """
-        if not self.context:
-            raise CrawlerException("Browser context not initialized")
+        Open a browser page that records its console errors.
 
-        page = await self.context.new_page()
+        Args:
+            context: Browser context owning the page
+
+        Returns:
+            Playwright page object
+        """
+        page = await context.new_page()
 
         # Track JavaScript errors
-        js_errors = []
+        js_errors: List[str] = []
+        self._console_messages[id(page)] = js_errors
 
         def log_console_message(msg):
             """Log console errors."""
@@ -145,6 +202,47 @@ class PlaywrightCrawler(BaseCrawler):
                 js_errors.append(f"[{msg.type}] {msg.text}")
 
         page.on("console", log_console_message)
+        return page
+
+    async def _acquire_page(self) -> Page:
+        """Take a warm page from the pool."""
+        return await self._page_pool.get()
+
+    async def _release_page(self, page: Page) -> None:
+        """
+        Return a page to the pool, replacing it if it was closed.
+
+        Args:
+            page: Page taken with _acquire_page
+        """
+        if page.is_closed():
+            self._console_messages.pop(id(page), None)
+            if self._should_stop:
+                return
+            page = await self._new_page(page.context)
+        self._page_pool.put_nowait(page)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True,
+    )
+    async def _fetch_page(self, url: str, page: Page) -> tuple[int, str]:
+        """
+        Fetch a page with Playwright and retries, each attempt waiting for a per-host slot.
+
+        Args:
+            url: URL to fetch
+            page: Pooled page used to load the URL
+
+        Returns:
+            Tuple of (status_code, html)
+        """
+        # Wait for this host's next request slot (on every attempt, retries included)
+        await self._throttle(url)
+
+        js_errors = self._console_messages.setdefault(id(page), [])
+        js_errors.clear()
 
         # Navigate to page
         try:
@@ -156,20 +254,26 @@ class PlaywrightCrawler(BaseCrawler):
 
             status_code = response.status if response else 0
 
-            # Wait for dynamic content to render (increased for JS frameworks)
-            await page.wait_for_timeout(3000)  # 3 seconds for React/Vue/etc
+            # Let late requests settle if goto did not already wait for them
+            if self.wait_until != "networkidle":
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=self.render_timeout)
+                except PlaywrightError:
+                    pass
 
-            # Additional wait: ensure body has actual content (not just "enable JS" message)
+            # Wait for dynamic content to render (not just an "enable JS" message),
+            # returning as soon as the document is complete with meaningful content
             try:
-                # Wait for body to have meaningful content
                 await page.wait_for_function(
                     """() => {
                         const body = document.body;
-                        return body && body.innerText && body.innerText.length > 100;
+                        return document.readyState === "complete"
+                            && body && body.innerText && body.innerText.length > 100;
                     }""",
-                    timeout=5000  # 5 seconds max
+                    polling=100,
+                    timeout=self.render_timeout,
                 )
-            except Exception:
+            except PlaywrightError:
                 # If timeout, continue anyway (some pages might be legitimately small)
                 pass
 
@@ -178,21 +282,21 @@ class PlaywrightCrawler(BaseCrawler):
 
             # Store JS errors for this URL
             if js_errors:
-                self.js_errors[url] = js_errors
+                self.js_errors[url] = list(js_errors)
 
-            return page, status_code, html
+            return status_code, html
 
         except PlaywrightError as e:
-            await page.close()
             raise CrawlerException(f"Failed to load {url}: {str(e)}") from e
 
-    async def _crawl_url(self, url: str, depth: int) -> None:
+    async def _crawl_url(self, url: str, depth: int, queue: asyncio.PriorityQueue) -> None:
         """
-        Crawl a single URL with Playwright.
+        Crawl a single URL with Playwright and enqueue its outgoing links.
 
         Args:
             url: URL to crawl
             depth: Current depth
+            queue: Crawl queue receiving discovered links
         """
         # Check stopping conditions
         if self._should_stop:
@@ -201,50 +305,46 @@ class PlaywrightCrawler(BaseCrawler):
         if depth > self.max_depth:
             return
 
-        if len(self.pages) >= self.max_pages:
-            return
-
-        if url in self.visited_urls:
+        # Count in-flight URLs too, so concurrent workers cannot overshoot max_pages
+        if self.visited_count >= self.max_pages:
             return
 
         if not self._should_crawl_url(url):
             return
 
         # Mark as visited
-        self.visited_urls.add(url)
-
-        # Apply delay
-        if self.delay > 0 and len(self.pages) > 0:
-            await asyncio.sleep(self.delay)
+        self.visited_count += 1
 
         page_obj = None
 
         try:
-            # Fetch page with Playwright
-            page_obj, status_code, html = await self._fetch_page(url)
+            # Fetch page with a pooled Playwright page
+            page_obj = await self._acquire_page()
+            async with self._host_slots(url):
+                status_code, html = await self._fetch_page(url, page_obj)
 
             # Capture screenshot if enabled
-            screenshot_data = None
+            screenshot_url = None
             if self.capture_screenshot:
-                screenshot_data = await self._capture_screenshot(page_obj)
+                screenshot_url = await self._capture_screenshot(page_obj, url)
 
             # Parse page
             crawled_page = await self._parse_page(
-                url, status_code, html, depth, screenshot_data
+                url, status_code, html, depth, screenshot_url
             )
             self.pages.append(crawled_page)
+            await self._buffer_page(crawled_page)
 
-            # Close the page
-            await page_obj.close()
+            # Return the page to the pool
+            await self._release_page(page_obj)
             page_obj = None
 
-            # Crawl outgoing links (sequentially to avoid browser overload)
+            # Enqueue outgoing links
             if depth < self.max_depth:
-                for link_url in crawled_page.outgoing_links[:10]:  # Limit links per page
-                    if len(self.pages) < self.max_pages:
-                        await self._crawl_url(link_url, depth + 1)
-                    else:
+                for link_url in crawled_page.outgoing_links:
+                    if self.visited_count >= self.max_pages:
                         break
+                    self._enqueue(queue, link_url, depth + 1)
 
         except Exception as e:
             self.errors.append(
@@ -253,32 +353,33 @@ class PlaywrightCrawler(BaseCrawler):
                     "depth": depth,
                     "error": str(e),
                     "js_errors": self.js_errors.get(url, []),
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": datetime.utcnow(),  # Serialized only if the errors are exported
                 }
             )
 
         finally:
-            # Ensure page is closed
+            # Ensure page is returned to the pool
             if page_obj:
-                await page_obj.close()
+                await self._release_page(page_obj)
 
-    async def _capture_screenshot(self, page: Page) -> Optional[str]:
+    async def _capture_screenshot(self, page: Page, url: str) -> Optional[str]:
         """
-        Capture screenshot of the page.
+        Capture screenshot of the page and upload it to object storage.
 
         Args:
             page: Playwright page object
+            url: URL of the page
 
         Returns:
-            Base64 encoded screenshot or None
+            Object URL of the screenshot or None
         """
         try:
             screenshot_bytes = await page.screenshot(
                 full_page=(self.screenshot_type == "fullpage"),
                 type="png",
             )
-            # Encode to base64 for storage
-            return base64.b64encode(screenshot_bytes).decode("utf-8")
+            key = f"screenshots/{self._url_fingerprint(url).hex()}.png"
+            return await upload_bytes(key, screenshot_bytes, content_type="image/png")
         except Exception as e:
             print(f"Screenshot capture failed: {e}")
             return None
@@ -289,7 +390,7 @@ class PlaywrightCrawler(BaseCrawler):
         status_code: int,
         html: str,
         depth: int,
-        screenshot_data: Optional[str] = None,
+        screenshot_url: Optional[str] = None,
     ) -> CrawledPage:
         """
         Parse rendered HTML and extract SEO information.
@@ -299,102 +400,25 @@ class PlaywrightCrawler(BaseCrawler):
             status_code: HTTP status code
             html: Rendered HTML content
             depth: Crawl depth
-            screenshot_data: Base64 encoded screenshot
+            screenshot_url: Object storage URL of the screenshot
 
         Returns:
             CrawledPage object
         """
-        soup = BeautifulSoup(html, "lxml")
-
-        # Extract title
-        title_tag = soup.find("title")
-        title = title_tag.get_text(strip=True) if title_tag else None
-
-        # Extract meta description
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        meta_description = meta_desc.get("content") if meta_desc else None
-
-        # Extract meta keywords
-        meta_kw = soup.find("meta", attrs={"name": "keywords"})
-        meta_keywords = meta_kw.get("content") if meta_kw else None
-
-        # Extract H1
-        h1_tag = soup.find("h1")
-        h1 = h1_tag.get_text(strip=True) if h1_tag else None
-
-        # Extract text content
-        for script in soup(["script", "style"]):
-            script.decompose()
-        text_content = soup.get_text(separator=" ", strip=True)
-        word_count = len(text_content.split())
-
-        # Extract lang from HTML attribute
-        html_tag = soup.find("html")
-        lang_from_html = html_tag.get("lang") if html_tag else None
-
-        # Auto-detect language
-        if not lang_from_html or len(lang_from_html) > 5:
-            detected = detect_language(text_content)
-            lang = detected if detected else lang_from_html
-        else:
-            lang = lang_from_html.split("-")[0] if lang_from_html else None
-
-        # Extract canonical
-        canonical_tag = soup.find("link", attrs={"rel": "canonical"})
-        canonical_url = canonical_tag.get("href") if canonical_tag else None
-
-        # Extract hreflang
-        hreflang_tags = soup.find_all("link", attrs={"rel": "alternate", "hreflang": True})
-        hreflang = (
-            {tag.get("hreflang"): tag.get("href") for tag in hreflang_tags}
-            if hreflang_tags
-            else None
-        )
-
-        # Extract outgoing links
-        outgoing_links = []
-        base_domain = urlparse(url).netloc
-
-        for link in soup.find_all("a", href=True):
-            href = link.get("href")
-            if not href:
-                continue
-
-            absolute_url = urljoin(url, href)
-            parsed = urlparse(absolute_url)
+        data = self._extract_page_data(url, html)
 
-            # Only internal links
-            if parsed.netloc == base_domain:
-                outgoing_links.append(absolute_url)
-
-        # Generate hashes
-        url_hash = hashlib.sha256(url.encode()).hexdigest()
-        content_hash = hashlib.md5(text_content.encode()).hexdigest()
-
-        # Store screenshot in rendered_html field if available (temporary solution)
-        # TODO: Store screenshots in MinIO/S3 instead
+        # Store screenshot reference in rendered_html field if available
         rendered_html_data = None
-        if screenshot_data:
-            rendered_html_data = f"SCREENSHOT:{screenshot_data[:1000]}"  # Truncate for DB
-        elif len(html) <= 10000:
-            rendered_html_data = html
+        if screenshot_url:
+            rendered_html_data = f"SCREENSHOT:{screenshot_url}"
+        else:
+            rendered_html_data = html[:MAX_RENDERED_HTML_LENGTH]  # Limit stored HTML
 
         return CrawledPage(
             url=url,
-            url_hash=url_hash,
             status_code=status_code,
             content_type="text/html",  # Playwright always returns HTML
-            title=title,
-            meta_description=meta_description,
-            meta_keywords=meta_keywords,
-            h1=h1,
-            text_content=text_content,
             rendered_html=rendered_html_data,
-            content_hash=content_hash,
-            word_count=word_count,
-            lang=lang,
-            canonical_url=canonical_url,
-            hreflang=hreflang,
             depth=depth,
-            outgoing_links=outgoing_links,
+            **data,
         )
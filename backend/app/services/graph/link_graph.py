@@ -1,9 +1,31 @@
 """Internal linking graph analysis and recommendations."""
 
-from typing import List, Dict, Any, Set, Tuple
-from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass
 import numpy as np
 
+try:
+    import scipy.sparse as sp
+except ImportError:  # PageRank falls back to a numpy-only propagation
+    sp = None
+
+
+@dataclass
+class GraphView:
+    """Integer adjacency view of the link graph, built once and shared by analyses."""
+    page_ids: List[int]
+    id_to_idx: Dict[int, int]
+    indptr: np.ndarray  # CSR row pointers: targets of row i are indices[indptr[i]:indptr[i + 1]]
+    indices: np.ndarray
+    out_degree: np.ndarray
+    in_degree: np.ndarray
+    orphan_idx: np.ndarray  # Row indices of pages with no incoming links
+    no_outgoing_idx: np.ndarray  # Row indices of pages with no outgoing links
+
+
+# Source pages per similarity matrix block in generate_recommendations
+SIMILARITY_BLOCK_SIZE = 1024
+
 
 class LinkGraphService:
     """
@@ -12,13 +34,44 @@ class LinkGraphService:
     Uses graph algorithms to compute metrics and semantic similarity for suggestions.
     """
 
-    def compute_metrics(self, pages: List[Any], links: List[Any]) -> Dict[str, Any]:
+    def __init__(self):
+        """Initialize link graph service."""
+        # Last packed embedding matrix, reused while the same embedding objects are passed in
+        self._packed_sources: List[Any] = []
+        self._packed_embeddings: Optional[np.ndarray] = None
+
+    def analyze(self, pages: List[Any], links: List[Any]) -> Dict[str, Any]:
+        """
+        Run every graph analysis on a single shared adjacency build.
+
+        Args:
+            pages: List of Page objects
+            links: List of Link objects
+
+        Returns:
+            Dict with metrics, page_importance and opportunities
+        """
+        if not pages:
+            return {"metrics": {}, "page_importance": {}, "opportunities": {}}
+
+        view = self._graph_view(pages, links)
+
+        return {
+            "metrics": self.compute_metrics(pages, links, view),
+            "page_importance": self._compute_page_importance(view),
+            "opportunities": self.detect_link_opportunities(pages, links, view),
+        }
+
+    def compute_metrics(
+        self, pages: List[Any], links: List[Any], view: Optional[GraphView] = None
+    ) -> Dict[str, Any]:
         """
         Compute graph metrics.
 
         Args:
             pages: List of Page objects
             links: List of Link objects
+            view: Prebuilt graph view (built from pages and links if omitted)
 
         Returns:
             Metrics dictionary
@@ -26,13 +79,8 @@ class LinkGraphService:
         if not pages:
             return {}
 
-        # Build adjacency lists
-        outgoing = defaultdict(list)
-        incoming = defaultdict(int)
-
-        for link in links:
-            outgoing[link.source_page_id].append(link.target_page_id)
-            incoming[link.target_page_id] += 1
+        view = view or self._graph_view(pages, links)
+        out_degree, in_degree = view.out_degree, view.in_degree
 
         # Compute metrics
         total_pages = len(pages)
@@ -40,73 +88,132 @@ class LinkGraphService:
         avg_outgoing = total_links / total_pages if total_pages > 0 else 0
 
         # Find orphan pages (no incoming links)
-        orphan_pages = [p.id for p in pages if incoming.get(p.id, 0) == 0]
+        orphan_pages = len(view.orphan_idx)
 
         # Find hub pages (many outgoing links)
         hub_threshold = avg_outgoing * 2
-        hub_pages = [
-            page_id for page_id, targets in outgoing.items() if len(targets) >= hub_threshold
-        ]
-
-        # Compute PageRank-like score
-        page_scores = self._compute_page_importance(pages, links)
+        hub_pages = np.count_nonzero((out_degree > 0) & (out_degree >= hub_threshold))
 
         return {
             "total_pages": total_pages,
             "total_links": total_links,
             "avg_links_per_page": round(avg_outgoing, 2),
-            "orphan_pages": len(orphan_pages),
-            "hub_pages": len(hub_pages),
-            "max_incoming_links": max(incoming.values()) if incoming else 0,
-            "pages_with_no_outgoing": sum(1 for p in pages if p.id not in outgoing),
+            "orphan_pages": orphan_pages,
+            "hub_pages": int(hub_pages),
+            "max_incoming_links": int(in_degree.max()),
+            "pages_with_no_outgoing": len(view.no_outgoing_idx),
         }
 
+    def _graph_view(self, pages: List[Any], links: List[Any]) -> GraphView:
+        """
+        Build an integer adjacency structure for the link graph.
+
+        Page ids are mapped to row indices in the order of ``pages``. Degrees
+        count every link touching a known page; the CSR adjacency only keeps
+        links whose source and target are both known.
+
+        Args:
+            pages: List of Page objects
+            links: List of Link objects
+
+        Returns:
+            GraphView over the pages
+        """
+        n = len(pages)
+        page_ids = np.fromiter((p.id for p in pages), dtype=np.int64, count=n)
+        id_to_idx = {int(page_id): i for i, page_id in enumerate(page_ids)}
+
+        src_ids = np.fromiter(
+            (link.source_page_id for link in links), dtype=np.int64, count=len(links)
+        )
+        tgt_ids = np.fromiter(
+            (link.target_page_id for link in links), dtype=np.int64, count=len(links)
+        )
+
+        # Map page ids to row indices with a binary search over the sorted ids
+        sorter = np.argsort(page_ids)
+        sorted_ids = page_ids[sorter]
+
+        def to_index(ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            if n == 0:
+                return ids, np.zeros(len(ids), dtype=bool)
+            pos = np.minimum(np.searchsorted(sorted_ids, ids), n - 1)
+            return sorter[pos], sorted_ids[pos] == ids
+
+        src, src_known = to_index(src_ids)
+        tgt, tgt_known = to_index(tgt_ids)
+
+        out_degree = np.bincount(src[src_known], minlength=n)
+        in_degree = np.bincount(tgt[tgt_known], minlength=n)
+
+        # CSR adjacency: targets of row i are indices[indptr[i]:indptr[i + 1]]
+        internal = src_known & tgt_known
+        src, tgt = src[internal], tgt[internal]
+        order = np.argsort(src, kind="stable")
+        indices = tgt[order]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+        return GraphView(
+            page_ids=page_ids.tolist(),
+            id_to_idx=id_to_idx,
+            indptr=indptr,
+            indices=indices,
+            out_degree=out_degree,
+            in_degree=in_degree,
+            orphan_idx=np.flatnonzero(in_degree == 0),
+            no_outgoing_idx=np.flatnonzero(out_degree == 0),
+        )
+
     def _compute_page_importance(
-        self, pages: List[Any], links: List[Any], damping: float = 0.85, iterations: int = 20
+        self, view: GraphView, damping: float = 0.85, iterations: int = 20
     ) -> Dict[int, float]:
         """
         Compute PageRank-like importance scores.
 
         Args:
-            pages: List of Page objects
-            links: List of Link objects
+            view: Graph view from _graph_view
             damping: Damping factor (default: 0.85)
             iterations: Number of iterations
 
         Returns:
             Dict mapping page_id to importance score
         """
-        if not pages:
+        page_ids = view.page_ids
+        n = len(page_ids)
+        if n == 0:
             return {}
 
-        # Build graph
-        page_ids = [p.id for p in pages]
-        n = len(page_ids)
-        id_to_idx = {pid: i for i, pid in enumerate(page_ids)}
+        # Only links between known pages take part (CSR adjacency)
+        indptr, indices = view.indptr, view.indices
+        out_degree = np.diff(indptr).astype(np.float64)
+        src = np.repeat(np.arange(n), np.diff(indptr))
 
-        # Outgoing links per page
-        outgoing = defaultdict(list)
-        for link in links:
-            if link.source_page_id in id_to_idx and link.target_page_id in id_to_idx:
-                outgoing[link.source_page_id].append(link.target_page_id)
+        weights = 1.0 / out_degree[src]
+        dangling = out_degree == 0
 
-        # Initialize scores
-        scores = np.ones(n) / n
+        if sp is not None:
+            # Column-stochastic transition matrix: M[target, source] = 1 / out_degree[source],
+            # so one sparse matrix-vector product propagates scores along every link
+            transition = sp.csr_matrix((weights, (indices, src)), shape=(n, n))
 
-        # Iterate
-        for _ in range(iterations):
-            new_scores = np.ones(n) * (1 - damping) / n
+            def propagate(scores: np.ndarray) -> np.ndarray:
+                return transition @ scores
+
+        else:
+            # Same product without scipy: scatter-add each link's share into its target
+            def propagate(scores: np.ndarray) -> np.ndarray:
+                return np.bincount(indices, weights=scores[src] * weights, minlength=n)
 
-            for i, page_id in enumerate(page_ids):
-                # Find pages linking to this page
-                for src_id, targets in outgoing.items():
-                    if page_id in targets:
-                        src_idx = id_to_idx[src_id]
-                        new_scores[i] += damping * scores[src_idx] / len(targets)
+        # Initialize scores
+        scores = np.full(n, 1.0 / n)
 
-            scores = new_scores
+        # Power iteration (pages without outgoing links spread their score uniformly)
+        for _ in range(iterations):
+            dangling_mass = scores[dangling].sum()
+            scores = (1 - damping) / n + damping * (propagate(scores) + dangling_mass / n)
 
-        return {page_id: float(scores[i]) for i, page_id in enumerate(page_ids)}
+        return dict(zip(page_ids, scores.tolist()))
 
     def generate_recommendations(
         self, pages: List[Any], top_k: int = 5, similarity_threshold: float = 0.6
@@ -130,22 +237,38 @@ class LinkGraphService:
         if len(pages_with_embeddings) < 2:
             return recommendations
 
-        # Compute pairwise similarities
-        embeddings = np.array([p.embedding for p in pages_with_embeddings])
-
-        for i, source_page in enumerate(pages_with_embeddings):
-            # Compute similarities to all other pages
-            source_emb = embeddings[i]
-            similarities = np.dot(embeddings, source_emb)
-
-            # Get top-k similar pages (excluding self)
-            similar_indices = np.argsort(similarities)[::-1][1 : top_k + 1]
-
-            page_recommendations = []
-            for idx in similar_indices:
-                sim_score = float(similarities[idx])
-
-                if sim_score >= similarity_threshold:
+        embeddings = self._pack_embeddings(pages_with_embeddings)
+        n = len(pages_with_embeddings)
+        k = min(top_k, n - 1)
+
+        # Compute pairwise similarities with one matrix product per block of
+        # source pages (bounds memory to block_size x n instead of n x n)
+        for start in range(0, n, SIMILARITY_BLOCK_SIZE):
+            similarities = embeddings[start : start + SIMILARITY_BLOCK_SIZE] @ embeddings.T
+            rows = np.arange(similarities.shape[0])
+
+            # Exclude self-similarity
+            similarities[rows, start + rows] = -np.inf
+
+            # Top-k per row: linear-time partition, then sort only the k survivors
+            top_indices = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(similarities, top_indices, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top_indices = np.take_along_axis(top_indices, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            # Scores are sorted, so survivors of the threshold are a prefix of each row
+            survivors = np.count_nonzero(top_scores >= similarity_threshold, axis=1)
+
+            # Convert to Python lists once per block instead of boxing scalars per element
+            top_indices_list = top_indices.tolist()
+            top_scores_list = top_scores.tolist()
+            survivors_list = survivors.tolist()
+
+            for row in np.flatnonzero(survivors).tolist():
+                count = survivors_list[row]
+                page_recommendations = []
+                for idx, sim_score in zip(top_indices_list[row][:count], top_scores_list[row][:count]):
                     target_page = pages_with_embeddings[idx]
                     page_recommendations.append(
                         {
@@ -157,11 +280,41 @@ class LinkGraphService:
                         }
                     )
 
-            if page_recommendations:
-                recommendations[source_page.id] = page_recommendations
+                recommendations[pages_with_embeddings[start + row].id] = page_recommendations
 
         return recommendations
 
+    def _pack_embeddings(self, pages: List[Any]) -> np.ndarray:
+        """
+        Pack page embeddings into one contiguous, L2-normalized float32 matrix.
+
+        Rows are normalized so that dot products are cosine similarities even
+        if an embedding was stored unnormalized. The matrix is cached and
+        reused when called again with the same embedding objects, so repeated
+        calls skip the per-page copy.
+
+        Args:
+            pages: Pages with non-null embeddings
+
+        Returns:
+            Array of shape (n_pages, dim)
+        """
+        sources = [p.embedding for p in pages]
+        if self._packed_embeddings is not None and len(sources) == len(self._packed_sources):
+            if all(a is b for a, b in zip(sources, self._packed_sources)):
+                return self._packed_embeddings
+
+        packed = np.empty((len(sources), len(sources[0])), dtype=np.float32)
+        for i, embedding in enumerate(sources):
+            packed[i] = embedding
+
+        norms = np.linalg.norm(packed, axis=1, keepdims=True)
+        packed /= np.maximum(norms, 1e-12)
+
+        self._packed_sources = sources
+        self._packed_embeddings = packed
+        return packed
+
     def find_missing_links(
         self, pages: List[Any], existing_links: List[Any], recommendations: Dict[int, List[Dict]]
     ) -> List[Dict[str, Any]]:
@@ -179,31 +332,40 @@ class LinkGraphService:
         # Build set of existing links
         existing = {(link.source_page_id, link.target_page_id) for link in existing_links}
 
-        missing_links = []
+        # Collect candidate edges in parallel lists, then sort once on a score array
+        sources = []
+        targets = []
+        score_list = []
 
         for source_id, recs in recommendations.items():
             for rec in recs:
                 target_id = rec["target_page_id"]
 
                 if (source_id, target_id) not in existing:
-                    missing_links.append(
-                        {
-                            "source_page_id": source_id,
-                            "target_page_id": target_id,
-                            "similarity_score": rec["similarity_score"],
-                            "priority": "high"
-                            if rec["similarity_score"] > 0.8
-                            else "medium",
-                        }
-                    )
-
-        # Sort by similarity score
-        missing_links.sort(key=lambda x: x["similarity_score"], reverse=True)
+                    sources.append(source_id)
+                    targets.append(target_id)
+                    score_list.append(rec["similarity_score"])
+
+        scores = np.asarray(score_list, dtype=np.float64)
+        priorities = np.where(scores > 0.8, "high", "medium").tolist()
+
+        # Sort by similarity score (stable, so ties keep recommendation order)
+        order = np.argsort(-scores, kind="stable").tolist()
+
+        missing_links = [
+            {
+                "source_page_id": sources[i],
+                "target_page_id": targets[i],
+                "similarity_score": score_list[i],
+                "priority": priorities[i],
+            }
+            for i in order
+        ]
 
         return missing_links
 
     def detect_link_opportunities(
-        self, pages: List[Any], links: List[Any]
+        self, pages: List[Any], links: List[Any], view: Optional[GraphView] = None
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Detect various link opportunities.
@@ -211,17 +373,12 @@ class LinkGraphService:
         Args:
             pages: List of Page objects
             links: List of Link objects
+            view: Prebuilt graph view (built from pages and links if omitted)
 
         Returns:
             Dict with different types of opportunities
         """
-        # Build incoming/outgoing maps
-        incoming_count = defaultdict(int)
-        outgoing_count = defaultdict(int)
-
-        for link in links:
-            outgoing_count[link.source_page_id] += 1
-            incoming_count[link.target_page_id] += 1
+        view = view or self._graph_view(pages, links)
 
         opportunities = {
             "orphan_pages": [],  # Pages with no incoming links
@@ -229,23 +386,24 @@ class LinkGraphService:
             "underlinked_pages": [],  # Important pages with few incoming links
         }
 
-        for page in pages:
-            page_id = page.id
-
-            # Orphan pages
-            if incoming_count.get(page_id, 0) == 0:
-                opportunities["orphan_pages"].append(
-                    {"page_id": page_id, "url": page.url, "title": page.title}
-                )
-
-            # Underlinked pages (have content but few links)
-            if page.word_count > 300 and incoming_count.get(page_id, 0) < 2:
+        # Orphan pages
+        for i in view.orphan_idx.tolist():
+            page = pages[i]
+            opportunities["orphan_pages"].append(
+                {"page_id": page.id, "url": page.url, "title": page.title}
+            )
+
+        # Underlinked pages (have content but few links); only pages with
+        # fewer than two incoming links need their content checked
+        for i in np.flatnonzero(view.in_degree < 2).tolist():
+            page = pages[i]
+            if page.word_count > 300:
                 opportunities["underlinked_pages"].append(
                     {
-                        "page_id": page_id,
+                        "page_id": page.id,
                         "url": page.url,
                         "title": page.title,
-                        "incoming_links": incoming_count.get(page_id, 0),
+                        "incoming_links": int(view.in_degree[i]),
                     }
                 )
 
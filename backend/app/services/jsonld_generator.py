@@ -1,119 +1,265 @@
 """JSON-LD generator service for structured data."""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, NamedTuple, Tuple
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import accumulate
 from urllib.parse import urlparse, urljoin
-import json
+import hashlib
 import re
-from bs4 import BeautifulSoup
+import threading
+import orjson
+from selectolax.lexbor import LexborHTMLParser
 
 from app.services.schema_detector import SchemaType
 from app.models.page import Page
 
 
+# CSS selectors used by _extract_metadata_from_html (selectolax caches compiled selectors)
+META_LINK_SELECTOR = 'meta[content], link[rel~="icon"][href]'
+CONTENT_ROOT_SELECTOR = 'article, main'
+CONTENT_IMAGE_SELECTOR = 'img[src]'
+SCHEMA_AUTHOR_SELECTOR = 'span[itemprop="author"]'
+TIME_SELECTOR = 'time[datetime]'
+
+# <meta> (attribute, value) pairs carrying article metadata
+METADATA_META_KEYS = frozenset({
+    ('property', 'og:image'),
+    ('name', 'twitter:image'),
+    ('name', 'author'),
+    ('property', 'article:author'),
+    ('property', 'article:published_time'),
+    ('property', 'article:modified_time'),
+    ('property', 'og:logo'),
+})
+
+# Pages larger than this are not parsed for metadata (crawl dates and defaults are used)
+METADATA_MAX_HTML_CHARS = 2_000_000
+
+# Parsed metadata kept per (site root, HTML digest); the HTML itself is not retained
+METADATA_CACHE_SIZE = 128
+
+# additional_data keys that make HTML metadata redundant for article schemas
+ARTICLE_OVERRIDE_KEYS = frozenset({
+    'author', 'image', 'publisher', 'date_published', 'date_modified',
+})
+
+# "@context"/"@type" header of every schema, built once per type
+SCHEMA_BASES = {
+    schema_type: {"@context": "https://schema.org", "@type": schema_type.value}
+    for schema_type in SchemaType
+}
+
+# WebSite search action (the target keeps a literal {search_term_string} placeholder)
+DEFAULT_SEARCH_TARGET = "{base_url}/search?q={{search_term_string}}"
+SEARCH_QUERY_INPUT = "required name=search_term_string"
+
+
+class ParsedURL(NamedTuple):
+    """URL components used by the schema generators."""
+    scheme: str
+    netloc: str
+    path: str
+    base_url: str
+    path_parts: Tuple[str, ...]
+
+
+@lru_cache(maxsize=4096)
+def _parsed_url(url: str) -> ParsedURL:
+    """
+    Parse a page URL once and derive the pieces the generators need.
+
+    Args:
+        url: Page URL
+
+    Returns:
+        ParsedURL with base URL and non-empty path segments
+    """
+    parsed = urlparse(url)
+    return ParsedURL(
+        scheme=parsed.scheme,
+        netloc=parsed.netloc,
+        path=parsed.path,
+        base_url=f"{parsed.scheme}://{parsed.netloc}",
+        path_parts=tuple(p for p in parsed.path.split('/') if p),
+    )
+
+
+def _empty_metadata() -> Dict[str, Any]:
+    """Metadata used when a page's HTML is not parsed."""
+    return {
+        'images': [],
+        'author': None,
+        'published_date': None,
+        'modified_date': None,
+        'logo': None,
+    }
+
+
+_metadata_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+_metadata_cache_lock = threading.Lock()
+
+
+def _cached_html_metadata(base_url: str, html: str) -> Dict[str, Any]:
+    """
+    Get page metadata, reusing the last parse of identical HTML.
+
+    Results are cached by (base_url, BLAKE2b digest of the HTML), so
+    regenerating schemas for an unchanged page skips the parse. The returned
+    dict is shared and must not be modified.
+
+    Args:
+        base_url: Site root used to resolve relative URLs
+        html: Page HTML
+
+    Returns:
+        Metadata dictionary
+    """
+    key = (base_url, hashlib.blake2b(html.encode(), digest_size=16).hexdigest())
+    with _metadata_cache_lock:
+        metadata = _metadata_cache.get(key)
+        if metadata is not None:
+            _metadata_cache.move_to_end(key)
+            return metadata
+
+    metadata = _parse_html_metadata(base_url, html)
+    with _metadata_cache_lock:
+        _metadata_cache[key] = metadata
+        while len(_metadata_cache) > METADATA_CACHE_SIZE:
+            _metadata_cache.popitem(last=False)
+    return metadata
+
+
+def _parse_html_metadata(base_url: str, html: str) -> Dict[str, Any]:
+    """
+    Extract rich metadata from page HTML.
+
+    Args:
+        base_url: Site root used to resolve relative URLs
+        html: Page HTML
+
+    Returns:
+        Metadata dictionary
+    """
+    metadata = _empty_metadata()
+
+    try:
+        tree = LexborHTMLParser(html)
+
+        # Single pass over <meta>/<link>: first non-empty value per (attribute, key)
+        meta: Dict[Tuple[str, str], str] = {}
+        icon_href = None
+        for node in tree.css(META_LINK_SELECTOR):
+            attrs = node.attributes
+            if node.tag == 'link':
+                if icon_href is None and attrs.get('href'):
+                    icon_href = attrs['href']
+                continue
+
+            content = attrs.get('content')
+            if not content:
+                continue
+            for attr in ('property', 'name'):
+                key = (attr, attrs.get(attr))
+                if key in METADATA_META_KEYS and key not in meta:
+                    meta[key] = content
+
+        # Extract images (dict as an ordered set)
+        images: Dict[str, None] = {}
+
+        # 1. OpenGraph image, 2. Twitter card image
+        for key in (('property', 'og:image'), ('name', 'twitter:image')):
+            if key in meta:
+                img_url = meta[key]
+                if not img_url.startswith('http'):
+                    img_url = urljoin(base_url, img_url)
+                images.setdefault(img_url, None)
+
+        # 3. First article image
+        article = tree.css_first(CONTENT_ROOT_SELECTOR)
+        if article:
+            first_img = article.css_first(CONTENT_IMAGE_SELECTOR)
+            if first_img and first_img.attributes.get('src'):
+                img_url = first_img.attributes['src']
+                if not img_url.startswith('http'):
+                    img_url = urljoin(base_url, img_url)
+                images.setdefault(img_url, None)
+
+        metadata['images'] = list(images)
+
+        # Extract author
+        # 1. Meta author, 2. Article:author
+        metadata['author'] = meta.get(('name', 'author')) or meta.get(('property', 'article:author'))
+
+        # 3. Schema.org author
+        if not metadata['author']:
+            schema_author = tree.css_first(SCHEMA_AUTHOR_SELECTOR)
+            if schema_author:
+                metadata['author'] = schema_author.text(separator='', strip=True)
+
+        # Extract dates
+        # 1. Article published time
+        metadata['published_date'] = meta.get(('property', 'article:published_time'))
+
+        # 2. Time tag with datetime
+        if not metadata['published_date']:
+            time_tag = tree.css_first(TIME_SELECTOR)
+            if time_tag:
+                metadata['published_date'] = time_tag.attributes['datetime']
+
+        # 3. Modified time
+        metadata['modified_date'] = meta.get(('property', 'article:modified_time'))
+
+        # Extract logo
+        metadata['logo'] = meta.get(('property', 'og:logo'))
+
+        # Link rel icon as fallback
+        if not metadata['logo'] and icon_href:
+            logo_url = icon_href
+            if not logo_url.startswith('http'):
+                logo_url = urljoin(base_url, logo_url)
+            metadata['logo'] = logo_url
+
+    except Exception as e:
+        # Fail silently, return empty metadata
+        pass
+
+    return metadata
+
+
 class JSONLDGenerator:
     """Service for generating Schema.org JSON-LD markup."""
 
+    def __init__(self):
+        """Initialize the schema type to generator dispatch table."""
+        self._generators = {
+            SchemaType.ARTICLE: partial(self._generate_article_schema, schema_type=SchemaType.ARTICLE),
+            SchemaType.BLOG_POSTING: partial(
+                self._generate_article_schema, schema_type=SchemaType.BLOG_POSTING
+            ),
+            SchemaType.NEWS_ARTICLE: partial(
+                self._generate_article_schema, schema_type=SchemaType.NEWS_ARTICLE
+            ),
+            SchemaType.PRODUCT: self._generate_product_schema,
+            SchemaType.ORGANIZATION: self._generate_organization_schema,
+            SchemaType.LOCAL_BUSINESS: self._generate_local_business_schema,
+            SchemaType.FAQ_PAGE: self._generate_faq_schema,
+            SchemaType.HOW_TO: self._generate_howto_schema,
+            SchemaType.WEBSITE: self._generate_website_schema,
+            SchemaType.WEB_PAGE: self._generate_webpage_schema,
+            SchemaType.BREADCRUMB_LIST: self._generate_breadcrumb_schema,
+        }
+
     def _extract_metadata_from_html(self, page: Page) -> Dict[str, Any]:
         """Extract rich metadata from page HTML."""
-        metadata = {
-            'images': [],
-            'author': None,
-            'published_date': None,
-            'modified_date': None,
-            'logo': None,
-        }
+        if not page.html_content or len(page.html_content) > METADATA_MAX_HTML_CHARS:
+            return _empty_metadata()
 
-        if not page.html_content:
-            return metadata
+        metadata = _cached_html_metadata(_parsed_url(page.url).base_url, page.html_content)
 
-        try:
-            soup = BeautifulSoup(page.html_content, 'lxml')
-            base_url = f"{urlparse(page.url).scheme}://{urlparse(page.url).netloc}"
-
-            # Extract images
-            # 1. OpenGraph image
-            og_image = soup.find('meta', property='og:image')
-            if og_image and og_image.get('content'):
-                img_url = og_image['content']
-                if not img_url.startswith('http'):
-                    img_url = urljoin(base_url, img_url)
-                metadata['images'].append(img_url)
-
-            # 2. Twitter card image
-            twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
-            if twitter_image and twitter_image.get('content'):
-                img_url = twitter_image['content']
-                if not img_url.startswith('http'):
-                    img_url = urljoin(base_url, img_url)
-                if img_url not in metadata['images']:
-                    metadata['images'].append(img_url)
-
-            # 3. First article image
-            article = soup.find(['article', 'main'])
-            if article:
-                first_img = article.find('img', src=True)
-                if first_img:
-                    img_url = first_img['src']
-                    if not img_url.startswith('http'):
-                        img_url = urljoin(base_url, img_url)
-                    if img_url not in metadata['images']:
-                        metadata['images'].append(img_url)
-
-            # Extract author
-            # 1. Meta author
-            author_meta = soup.find('meta', attrs={'name': 'author'})
-            if author_meta and author_meta.get('content'):
-                metadata['author'] = author_meta['content']
-
-            # 2. Article:author
-            if not metadata['author']:
-                article_author = soup.find('meta', property='article:author')
-                if article_author and article_author.get('content'):
-                    metadata['author'] = article_author['content']
-
-            # 3. Schema.org author
-            if not metadata['author']:
-                schema_author = soup.find('span', itemprop='author')
-                if schema_author:
-                    metadata['author'] = schema_author.get_text(strip=True)
-
-            # Extract dates
-            # 1. Article published time
-            published_meta = soup.find('meta', property='article:published_time')
-            if published_meta and published_meta.get('content'):
-                metadata['published_date'] = published_meta['content']
-
-            # 2. Time tag with datetime
-            if not metadata['published_date']:
-                time_tag = soup.find('time', datetime=True)
-                if time_tag:
-                    metadata['published_date'] = time_tag['datetime']
-
-            # 3. Modified time
-            modified_meta = soup.find('meta', property='article:modified_time')
-            if modified_meta and modified_meta.get('content'):
-                metadata['modified_date'] = modified_meta['content']
-
-            # Extract logo
-            logo_meta = soup.find('meta', property='og:logo')
-            if logo_meta and logo_meta.get('content'):
-                metadata['logo'] = logo_meta['content']
-
-            # Link rel icon as fallback
-            if not metadata['logo']:
-                icon_link = soup.find('link', rel='icon')
-                if icon_link and icon_link.get('href'):
-                    logo_url = icon_link['href']
-                    if not logo_url.startswith('http'):
-                        logo_url = urljoin(base_url, logo_url)
-                    metadata['logo'] = logo_url
-
-        except Exception as e:
-            # Fail silently, return empty metadata
-            pass
-
-        return metadata
+        # Copy the cached result so callers may modify it
+        return {**metadata, 'images': list(metadata['images'])}
 
     def generate_schema(
         self,
@@ -133,32 +279,11 @@ class JSONLDGenerator:
             JSON-LD dictionary
         """
         # Base context
-        schema = {
-            "@context": "https://schema.org",
-            "@type": schema_type.value
-        }
+        schema = dict(SCHEMA_BASES[schema_type])
 
-        # Route to appropriate generator
-        if schema_type in [SchemaType.ARTICLE, SchemaType.BLOG_POSTING, SchemaType.NEWS_ARTICLE]:
-            schema.update(self._generate_article_schema(page, schema_type, additional_data))
-        elif schema_type == SchemaType.PRODUCT:
-            schema.update(self._generate_product_schema(page, additional_data))
-        elif schema_type == SchemaType.ORGANIZATION:
-            schema.update(self._generate_organization_schema(page, additional_data))
-        elif schema_type == SchemaType.LOCAL_BUSINESS:
-            schema.update(self._generate_local_business_schema(page, additional_data))
-        elif schema_type == SchemaType.FAQ_PAGE:
-            schema.update(self._generate_faq_schema(page, additional_data))
-        elif schema_type == SchemaType.HOW_TO:
-            schema.update(self._generate_howto_schema(page, additional_data))
-        elif schema_type == SchemaType.WEBSITE:
-            schema.update(self._generate_website_schema(page, additional_data))
-        elif schema_type == SchemaType.WEB_PAGE:
-            schema.update(self._generate_webpage_schema(page, additional_data))
-        elif schema_type == SchemaType.BREADCRUMB_LIST:
-            schema.update(self._generate_breadcrumb_schema(page, additional_data))
-        else:
-            schema.update(self._generate_webpage_schema(page, additional_data))
+        # Route to appropriate generator (generic WebPage for other types)
+        handler = self._generators.get(schema_type, self._generate_webpage_schema)
+        schema.update(handler(page, additional_data=additional_data))
 
         return schema
 
@@ -169,18 +294,27 @@ class JSONLDGenerator:
         additional_data: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Generate Article, BlogPosting, or NewsArticle schema."""
-        parsed_url = urlparse(page.url)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-
-        # Extract metadata from HTML
-        metadata = self._extract_metadata_from_html(page)
+        parsed_url = _parsed_url(page.url)
+        base_url = parsed_url.base_url
 
-        # Use extracted dates or fallback to crawl dates
-        published_date = metadata['published_date'] or (
-            page.created_at.isoformat() if page.created_at else datetime.utcnow().isoformat()
+        # Extract metadata from HTML, unless additional_data overrides what it would provide
+        if additional_data and ARTICLE_OVERRIDE_KEYS.issubset(additional_data.keys()):
+            metadata = _empty_metadata()
+        else:
+            metadata = self._extract_metadata_from_html(page)
+
+        # Dates (priority: additional_data > extracted > crawl dates > current time)
+        overrides = additional_data or {}
+        now_iso = datetime.utcnow().isoformat()
+        published_date = (
+            overrides.get('date_published')
+            or metadata['published_date']
+            or (page.created_at.isoformat() if page.created_at else now_iso)
         )
-        modified_date = metadata['modified_date'] or (
-            page.updated_at.isoformat() if page.updated_at else datetime.utcnow().isoformat()
+        modified_date = (
+            overrides.get('date_modified')
+            or metadata['modified_date']
+            or (page.updated_at.isoformat() if page.updated_at else now_iso)
         )
 
         schema = {
@@ -296,8 +430,8 @@ class JSONLDGenerator:
         additional_data: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Generate Organization schema."""
-        parsed_url = urlparse(page.url)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        parsed_url = _parsed_url(page.url)
+        base_url = parsed_url.base_url
 
         schema = {
             "name": additional_data.get('name', parsed_url.netloc) if additional_data else parsed_url.netloc,
@@ -323,8 +457,8 @@ class JSONLDGenerator:
         additional_data: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Generate LocalBusiness schema."""
-        parsed_url = urlparse(page.url)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        parsed_url = _parsed_url(page.url)
+        base_url = parsed_url.base_url
 
         schema = {
             "name": additional_data.get('name', parsed_url.netloc) if additional_data else parsed_url.netloc,
@@ -418,8 +552,8 @@ class JSONLDGenerator:
         additional_data: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Generate WebSite schema."""
-        parsed_url = urlparse(page.url)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        parsed_url = _parsed_url(page.url)
+        base_url = parsed_url.base_url
 
         schema = {
             "name": page.title or parsed_url.netloc,
@@ -427,20 +561,16 @@ class JSONLDGenerator:
             "description": page.meta_description or ""
         }
 
-        # Add search action for homepage
+        # Add search action for homepage (default: the site's /search page)
         if additional_data and 'search_url' in additional_data:
-            schema["potentialAction"] = {
-                "@type": "SearchAction",
-                "target": additional_data['search_url'],
-                "query-input": "required name=search_term_string"
-            }
+            target = additional_data['search_url']
         else:
-            # Default search action
-            schema["potentialAction"] = {
-                "@type": "SearchAction",
-                "target": f"{base_url}/search?q={{search_term_string}}",
-                "query-input": "required name=search_term_string"
-            }
+            target = DEFAULT_SEARCH_TARGET.format(base_url=base_url)
+        schema["potentialAction"] = {
+            "@type": "SearchAction",
+            "target": target,
+            "query-input": SEARCH_QUERY_INPUT
+        }
 
         return schema
 
@@ -464,9 +594,9 @@ class JSONLDGenerator:
         additional_data: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Generate BreadcrumbList schema."""
-        parsed_url = urlparse(page.url)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-        path_parts = [p for p in parsed_url.path.split('/') if p]
+        parsed_url = _parsed_url(page.url)
+        base_url = parsed_url.base_url
+        path_parts = parsed_url.path_parts
 
         # Build breadcrumb items
         items = [{
@@ -476,14 +606,15 @@ class JSONLDGenerator:
             "item": base_url
         }]
 
-        current_path = base_url
-        for idx, part in enumerate(path_parts, start=2):
-            current_path += f"/{part}"
+        # Each crumb URL extends the previous one by a single path segment
+        crumb_urls = accumulate(path_parts, lambda prefix, part: f"{prefix}/{part}", initial=base_url)
+        next(crumb_urls)
+        for idx, (part, crumb_url) in enumerate(zip(path_parts, crumb_urls), start=2):
             items.append({
                 "@type": "ListItem",
                 "position": idx,
                 "name": part.replace('-', ' ').replace('_', ' ').title(),
-                "item": current_path
+                "item": crumb_url
             })
 
         schema = {
@@ -510,7 +641,7 @@ class JSONLDGenerator:
 
         # Validate JSON structure
         try:
-            json.dumps(schema)
+            orjson.dumps(schema, option=orjson.OPT_NON_STR_KEYS)
         except (TypeError, ValueError) as e:
             errors.append(f"Invalid JSON structure: {str(e)}")
 
@@ -547,7 +678,9 @@ class JSONLDGenerator:
         Returns:
             Formatted <script> tag with JSON-LD
         """
-        json_str = json.dumps(schema, indent=2, ensure_ascii=False)
+        json_str = orjson.dumps(
+            schema, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
         return f'<script type="application/ld+json">\n{json_str}\n</script>'
 
 
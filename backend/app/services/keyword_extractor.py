@@ -1,17 +1,63 @@
 """Keyword extraction service for internal linking recommendations."""
 
-from typing import List, Tuple, Optional
-from keybert import KeyBERT
+from typing import Dict, List, Tuple, Optional
+import numpy as np
 import re
 
 
+# Texts longer than this skip KeyBERT even when enabled (its cost grows with the text)
+SEMANTIC_MAX_CHARS = 20000
+
+# Word ids are packed 21 bits each into one int64 key, so n-grams go up to trigrams
+NGRAM_ID_BITS = 21
+NGRAM_MAX_N = 3
+NGRAM_MAX_WORDS = (1 << NGRAM_ID_BITS) - 2
+
+# Words of 3+ characters: a letter, then letters/digits/apostrophes/hyphens, ending on a letter or digit
+WORD_PATTERN = re.compile(r"[^\W\d_][\w'-]+[^\W_]")
+
+# Candidate entity words (letters of any script, internal hyphens kept so "Jean-Pierre" stays
+# whole); length and capitalization are checked in extract_entities
+ENTITY_WORD_PATTERN = re.compile(r"(?<!\w)[^\W\d_]+(?:-[^\W\d_]+)*")
+
+# URLs and email addresses removed by _clean_text (one alternation, one pass)
+URL_OR_EMAIL_PATTERN = re.compile(r'https?://\S+|\S+@\S+')
+
+# Common English words never counted as keywords
+STOPWORDS = frozenset({
+    "a", "about", "above", "after", "again", "against", "all", "also", "am", "an",
+    "and", "any", "are", "as", "at", "be", "because", "been", "before", "being",
+    "below", "between", "both", "but", "by", "can", "could", "did", "do", "does",
+    "doing", "down", "during", "each", "few", "for", "from", "further", "get", "had",
+    "has", "have", "having", "he", "her", "here", "hers", "him", "his", "how",
+    "i", "if", "in", "into", "is", "it", "its", "just", "like", "may",
+    "me", "more", "most", "much", "must", "my", "no", "nor", "not", "now",
+    "of", "off", "on", "once", "one", "only", "or", "other", "our", "ours",
+    "out", "over", "own", "same", "she", "should", "so", "some", "such", "than",
+    "that", "the", "their", "theirs", "them", "then", "there", "these", "they", "this",
+    "those", "through", "to", "too", "under", "until", "up", "use", "used", "very",
+    "was", "we", "were", "what", "when", "where", "which", "while", "who", "whom",
+    "why", "will", "with", "would", "you", "your", "yours",
+})
+
+
 class KeywordExtractor:
     """Service for extracting keywords from page content."""
 
-    def __init__(self):
-        """Initialize KeyBERT model."""
-        # Use lightweight model for keyword extraction
-        self.kw_model = KeyBERT(model='all-MiniLM-L6-v2')
+    def __init__(self, use_semantic: bool = False):
+        """
+        Initialize keyword extractor.
+
+        Args:
+            use_semantic: Rank keywords with KeyBERT (loads a transformer model
+                and runs it on every call) instead of n-gram frequency
+        """
+        self.kw_model = None
+        if use_semantic:
+            from keybert import KeyBERT
+
+            # Use lightweight model for keyword extraction
+            self.kw_model = KeyBERT(model='all-MiniLM-L6-v2')
 
     def extract_keywords(
         self,
@@ -21,7 +67,10 @@ class KeywordExtractor:
         max_ngram: int = 3,
     ) -> List[Tuple[str, float]]:
         """
-        Extract keywords from text using KeyBERT.
+        Extract keywords from text.
+
+        Uses n-gram frequency, or KeyBERT when semantic extraction is enabled
+        (very long texts always use n-gram frequency).
 
         Args:
             text: Text content to extract keywords from
@@ -38,6 +87,9 @@ class KeywordExtractor:
         # Clean text
         text = self._clean_text(text)
 
+        if self.kw_model is None or len(text) > SEMANTIC_MAX_CHARS:
+            return self._extract_ngrams_fast(text, top_n, min_ngram, max_ngram)
+
         # Extract keywords with KeyBERT
         keywords = self.kw_model.extract_keywords(
             text,
@@ -51,6 +103,76 @@ class KeywordExtractor:
 
         return keywords
 
+    def _extract_ngrams_fast(
+        self,
+        text: str,
+        top_n: int,
+        min_ngram: int,
+        max_ngram: int,
+    ) -> List[Tuple[str, float]]:
+        """
+        Extract keywords by n-gram frequency.
+
+        Words are mapped to integer ids and each n-gram is packed into a single
+        int64 key, so counting runs in numpy and phrases are only rebuilt as
+        strings for the top results.
+
+        Args:
+            text: Cleaned text content
+            top_n: Number of top keywords to return
+            min_ngram: Minimum n-gram size
+            max_ngram: Maximum n-gram size (capped at 3)
+
+        Returns:
+            List of (keyword, score) tuples, score relative to the most frequent
+        """
+        words = [w for w in WORD_PATTERN.findall(text.lower()) if w not in STOPWORDS][:NGRAM_MAX_WORDS]
+        if not words:
+            return []
+
+        # Ids start at 1 so that 0 marks an unused slot in shorter n-grams
+        vocab: Dict[str, int] = {}
+        ids = np.fromiter(
+            (vocab.setdefault(w, len(vocab) + 1) for w in words), dtype=np.int64, count=len(words)
+        )
+
+        sizes = [
+            (n, len(ids) - n + 1)
+            for n in range(max(min_ngram, 1), min(max_ngram, NGRAM_MAX_N) + 1)
+            if len(ids) - n + 1 > 0
+        ]
+        if not sizes:
+            return []
+
+        # Write every n-gram size into one preallocated key array (no per-size copies)
+        keys = np.empty(sum(count for _, count in sizes), dtype=np.int64)
+        start = 0
+        for n, count in sizes:
+            packed = keys[start : start + count]
+            packed[:] = ids[:count]
+            for offset in range(1, n):
+                packed |= ids[offset : offset + count] << (NGRAM_ID_BITS * offset)
+            start += count
+
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        top = np.argsort(-counts, kind="stable")[:top_n]
+        if not top.size:
+            return []
+        max_count = counts[top[0]]
+
+        # Decode only the selected keys back to phrases
+        id_to_word = [""] + list(vocab)
+        mask = (1 << NGRAM_ID_BITS) - 1
+        keywords = []
+        for key, count in zip(unique_keys[top].tolist(), counts[top].tolist()):
+            parts = []
+            while key:
+                parts.append(id_to_word[key & mask])
+                key >>= NGRAM_ID_BITS
+            keywords.append((" ".join(parts), round(count / max_count, 4)))
+
+        return keywords
+
     def extract_entities(self, text: str) -> List[str]:
         """
         Extract named entities from text (simpler fallback without spaCy).
@@ -63,42 +185,33 @@ class KeywordExtractor:
         """
         # For now, just extract capitalized phrases (proper nouns)
         # This is a lightweight alternative to full NER
-        words = text.split()
-        entities = []
-
-        current_entity = []
-        for word in words:
-            # Check if word starts with capital letter (potential entity)
-            if word and word[0].isupper() and len(word) > 2:
-                current_entity.append(word)
+        # Runs of capitalized words separated only by whitespace form one entity
+        spans: List[List[int]] = []
+        in_run = False
+        for match in ENTITY_WORD_PATTERN.finditer(text):
+            word = match.group()
+            if len(word) < 3 or not word[0].isupper():
+                in_run = False
+                continue
+            start, end = match.span()
+            if in_run and text[spans[-1][1]:start].isspace():
+                spans[-1][1] = end
             else:
-                if current_entity and len(current_entity) >= 1:
-                    entity = ' '.join(current_entity)
-                    if len(entity) > 3:  # Filter out very short entities
-                        entities.append(entity)
-                current_entity = []
+                spans.append([start, end])
+            in_run = True
 
-        # Add last entity if exists
-        if current_entity:
-            entity = ' '.join(current_entity)
-            if len(entity) > 3:
-                entities.append(entity)
+        entities = (text[start:end] for start, end in spans if end - start > 3)
 
-        # Remove duplicates and return
-        return list(set(entities))[:20]
+        # Remove duplicates (keeping first-occurrence order) and return
+        return list(dict.fromkeys(entities))[:20]
 
     def _clean_text(self, text: str) -> str:
         """Clean text for keyword extraction."""
-        # Remove URLs
-        text = re.sub(r'http[s]?://\S+', '', text)
-
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove URLs and email addresses
+        text = URL_OR_EMAIL_PATTERN.sub('', text)
 
-        return text.strip()
+        # Collapse whitespace (split/join also strips both ends)
+        return ' '.join(text.split())
 
 
 # Singleton instance
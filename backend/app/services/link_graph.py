@@ -1,14 +1,52 @@
 """Link graph service using Neo4j for internal linking analysis."""
 
-from typing import List, Dict, Any, Optional
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from functools import cached_property
+from itertools import chain
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+import orjson
 from neo4j import GraphDatabase
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.redis import get_sync_redis
 from app.models.page import Page
 
+try:
+    import cudf
+    import cugraph
+except ImportError:  # PageRank runs on the CPU
+    cugraph = None
+
+
+# Page columns read into graph nodes (text and HTML are never loaded)
+GRAPH_PAGE_COLUMNS = (
+    Page.id,
+    Page.url,
+    Page.title,
+    Page.seo_score,
+    Page.depth,
+)
+
+# Rows fetched per round trip when streaming project pages
+GRAPH_PAGE_BATCH_SIZE = 1000
+
+# PageRank precision: ranks are shown to 4 decimals, and float32 halves the
+# memory traffic of each sparse matrix-vector product
+PAGERANK_DTYPE = np.float32
+
+# Redis key prefix and lifetime (seconds) of the last PageRank per project
+PAGERANK_SNAPSHOT_PREFIX = "pagerank"
+PAGERANK_SNAPSHOT_TTL = 60 * 60 * 24 * 7
+
+# Projects whose last PageRank is kept in process (older ones reload the Redis snapshot)
+PAGERANK_CACHE_SIZE = 32
+
 
 @dataclass
 class GraphNode:
@@ -42,6 +80,110 @@ class GraphStats:
     authority_pages: List[GraphNode]  # Pages with high PageRank
 
 
+@dataclass
+class LinkGraphCSR:
+    """
+    Link graph as integer arrays, read once from the database.
+
+    Page i links to the pages at positions indices[indptr[i]:indptr[i + 1]];
+    node columns are aligned with page_ids.
+    """
+    page_ids: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    urls: List[str]
+    titles: List[str]
+    seo_scores: np.ndarray
+    depths: np.ndarray
+
+    @classmethod
+    def from_edges(
+        cls,
+        page_ids: List[int],
+        edges: List[Tuple[int, int]],
+        **columns: Any
+    ) -> "LinkGraphCSR":
+        """
+        Build a graph from (source ID, target ID) pairs.
+
+        Args:
+            page_ids: Page IDs, in node order
+            edges: Links between those pages (duplicates are merged)
+            **columns: Optional node columns (urls, titles, seo_scores, depths)
+
+        Returns:
+            Link graph
+        """
+        n = len(page_ids)
+        id_to_idx = {page_id: idx for idx, page_id in enumerate(page_ids)}
+        pairs = np.array(
+            [(id_to_idx[source], id_to_idx[target]) for source, target in dict.fromkeys(edges)],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+
+        # Stable sort by source keeps each page's links in insertion order
+        order = np.argsort(pairs[:, 0], kind='stable')
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs[:, 0], minlength=n), out=indptr[1:])
+
+        return cls(
+            page_ids=np.array(page_ids, dtype=np.int64),
+            indptr=indptr,
+            indices=pairs[order, 1],
+            urls=columns.get("urls", [""] * n),
+            titles=columns.get("titles", [""] * n),
+            seo_scores=np.array(columns.get("seo_scores", [0.0] * n), dtype=np.float64),
+            depths=np.array(columns.get("depths", [0] * n), dtype=np.int64),
+        )
+
+    @property
+    def num_pages(self) -> int:
+        """Number of pages."""
+        return len(self.page_ids)
+
+    @property
+    def num_links(self) -> int:
+        """Number of links."""
+        return len(self.indices)
+
+    @cached_property
+    def out_degree(self) -> np.ndarray:
+        """Outgoing link count per page."""
+        return np.diff(self.indptr)
+
+    @cached_property
+    def in_degree(self) -> np.ndarray:
+        """Incoming link count per page."""
+        return np.bincount(self.indices, minlength=self.num_pages)
+
+    @cached_property
+    def id_to_idx(self) -> Dict[int, int]:
+        """Node position of each page ID."""
+        return {page_id: idx for idx, page_id in enumerate(self.page_ids.tolist())}
+
+    def structure_digest(self) -> bytes:
+        """
+        Hash the nodes and links (PageRank depends on nothing else).
+
+        Returns:
+            BLAKE2b-128 digest of page_ids, indptr and indices
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (self.page_ids, self.indptr, self.indices):
+            digest.update(array.tobytes())
+        return digest.digest()
+
+    def edge_ids(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the links as page IDs.
+
+        Returns:
+            (source page IDs, target page IDs), in node order
+        """
+        sources = np.repeat(self.page_ids, self.out_degree)
+        return sources, self.page_ids[self.indices]
+
+
 class LinkGraphService:
     """Service for building and analyzing link graphs."""
 
@@ -57,11 +199,15 @@ class LinkGraphService:
         except Exception as e:
             print(f"Neo4j not available: {e}")
 
+        # Last PageRank per project (LRU), with the digest of the graph it was computed for
+        self._pagerank_cache: "OrderedDict[int, Tuple[bytes, Dict[int, float]]]" = OrderedDict()
+        self._pagerank_cache_lock = threading.Lock()
+
     def build_graph(
         self,
         db: Session,
         project_id: int
-    ) -> nx.DiGraph:
+    ) -> LinkGraphCSR:
         """
         Build a directed graph from project pages.
 
@@ -70,82 +216,255 @@ class LinkGraphService:
             project_id: Project ID
 
         Returns:
-            NetworkX directed graph
+            Link graph as CSR arrays
         """
-        # Get all pages for the project
-        pages = db.query(Page).filter(Page.project_id == project_id).all()
-
-        # Create directed graph
-        G = nx.DiGraph()
-
-        # Add nodes
-        for page in pages:
-            G.add_node(
-                page.id,
-                url=page.url,
-                title=page.title or "",
-                seo_score=page.seo_score or 0,
-                depth=page.depth,
-                word_count=page.word_count
-            )
+        # Stream the node columns as plain rows (no ORM objects, no text or HTML)
+        rows = db.query(*GRAPH_PAGE_COLUMNS).filter(
+            Page.project_id == project_id
+        ).yield_per(GRAPH_PAGE_BATCH_SIZE)
+
+        # Node columns, plus the first pages seen at each depth (link targets)
+        page_ids, urls, titles, seo_scores, depths = [], [], [], [], []
+        first_at_depth: Dict[int, List[int]] = defaultdict(list)
+        for idx, row in enumerate(rows):
+            page_ids.append(row.id)
+            urls.append(row.url)
+            titles.append(row.title or "")
+            seo_scores.append(row.seo_score or 0)
+            depths.append(row.depth)
+            if len(first_at_depth[row.depth]) < 5:  # Limit to 5 links per page
+                first_at_depth[row.depth].append(idx)
 
         # Add edges (internal links)
         # Note: We need to parse outgoing_links from pages
-        # For now, we'll use a simple approach based on URL matching
-        url_to_id = {page.url: page.id for page in pages}
-
-        for page in pages:
-            # Get all pages this page links to
-            # We'll need to query from the database or parse from rendered_html
-            # For simplicity, let's use internal_links_count as a proxy
-            # In a real implementation, we'd parse the HTML or use a Links table
-
-            # For now, create synthetic edges based on depth hierarchy
-            # Pages at depth N typically link to pages at depth N+1
-            if page.depth < 5:  # Reasonable limit
-                targets = [p for p in pages if p.depth == page.depth + 1]
-                for target in targets[:5]:  # Limit to 5 links per page
-                    G.add_edge(page.id, target.id)
-
-        return G
-
-    def calculate_pagerank(self, G: nx.DiGraph) -> Dict[int, float]:
-        """Calculate PageRank for all nodes."""
-        try:
-            pagerank = nx.pagerank(G, alpha=0.85)
-            return pagerank
-        except:
-            # If graph is empty or has issues, return empty dict
+        # We'll need to query from the database or parse from rendered_html
+        # In a real implementation, we'd parse the HTML or use a Links table
+
+        # For now, create synthetic edges based on depth hierarchy
+        # Pages at depth N typically link to pages at depth N+1
+        targets = [
+            first_at_depth.get(depth + 1, []) if depth < 5 else []  # Reasonable limit
+            for depth in depths
+        ]
+        n = len(page_ids)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, targets), np.int64, n), out=indptr[1:])
+
+        return LinkGraphCSR(
+            page_ids=np.array(page_ids, dtype=np.int64),
+            indptr=indptr,
+            indices=np.fromiter(chain.from_iterable(targets), np.int64, int(indptr[-1])),
+            urls=urls,
+            titles=titles,
+            seo_scores=np.array(seo_scores, dtype=np.float64),
+            depths=np.array(depths, dtype=np.int64),
+        )
+
+    def calculate_pagerank(
+        self,
+        graph: LinkGraphCSR,
+        alpha: float = 0.85,
+        max_iter: int = 100,
+        tol: float = 1.0e-6,
+        initial: Optional[Dict[int, float]] = None
+    ) -> Dict[int, float]:
+        """
+        Calculate PageRank for all nodes.
+
+        Power iteration on a CSR transition matrix built once from the graph
+        (same model as nx.pagerank: pages without outgoing links spread their
+        rank uniformly). Large graphs run on the GPU when cuGraph is installed.
+
+        Args:
+            graph: Link graph
+            alpha: Damping factor
+            max_iter: Maximum number of power iterations
+            tol: Convergence tolerance per node
+            initial: Starting ranks (e.g. from before the graph changed); pages
+                missing from it start at 1/N
+
+        Returns:
+            Dict mapping page ID to PageRank (empty for an empty graph)
+        """
+        n = graph.num_pages
+        if n == 0:
             return {}
 
-    def find_orphan_pages(self, G: nx.DiGraph) -> List[int]:
+        out_degree = graph.out_degree
+
+        # cuGraph only knows vertices that appear in the edge list
+        if (
+            cugraph is not None
+            and n >= settings.GPU_PAGERANK_THRESHOLD
+            and not np.any((out_degree == 0) & (graph.in_degree == 0))
+        ):
+            return self._calculate_pagerank_gpu(graph, alpha, max_iter, tol, initial)
+
+        dangling = out_degree == 0
+        # Pages without outgoing links, gathered once (their rank is re-spread every iteration)
+        dangling_idx = np.flatnonzero(dangling)
+
+        # Transposed row-stochastic matrix, built once: each row lists a page's incoming
+        # links, so one SpMV accumulates every page's new rank in a single sequential pass
+        inv_out_degree = np.divide(1.0, out_degree, out=np.zeros(n, PAGERANK_DTYPE), where=~dangling)
+        transition = sp.csr_array(
+            (np.repeat(inv_out_degree, out_degree), graph.indices, graph.indptr), shape=(n, n)
+        ).T.tocsr()
+
+        page_ids = graph.page_ids.tolist()
+        if initial:
+            # Warm start: after small graph changes the old ranks are close to the fixed point
+            ranks = np.fromiter((initial.get(page_id, 1.0 / n) for page_id in page_ids), PAGERANK_DTYPE, n)
+            ranks /= ranks.sum()
+        else:
+            ranks = np.full(n, 1.0 / n, dtype=PAGERANK_DTYPE)
+        for _ in range(max_iter):
+            previous = ranks
+            ranks = alpha * (transition @ ranks + ranks[dangling_idx].sum() / n) + (1 - alpha) / n
+            if np.abs(ranks - previous).sum() < n * tol:
+                break
+
+        return dict(zip(page_ids, ranks.tolist()))
+
+    def _calculate_pagerank_gpu(
+        self,
+        graph: LinkGraphCSR,
+        alpha: float,
+        max_iter: int,
+        tol: float,
+        initial: Optional[Dict[int, float]]
+    ) -> Dict[int, float]:
+        """
+        Calculate PageRank on the GPU with cuGraph (for large projects).
+
+        Args:
+            graph: Link graph without isolated pages
+            alpha: Damping factor
+            max_iter: Maximum number of power iterations
+            tol: Convergence tolerance
+            initial: Starting ranks
+
+        Returns:
+            Dict mapping page ID to PageRank
+        """
+        sources, targets = graph.edge_ids()
+        gpu_graph = cugraph.Graph(directed=True)
+        gpu_graph.from_cudf_edgelist(
+            cudf.DataFrame({"source": sources, "target": targets}),
+            source="source",
+            destination="target",
+        )
+
+        nstart = None
+        if initial:
+            # Pages removed since the previous run are not vertices any more
+            previous = {
+                page_id: initial[page_id] for page_id in graph.page_ids.tolist() if page_id in initial
+            }
+            nstart = cudf.DataFrame({
+                "vertex": list(previous.keys()),
+                "values": list(previous.values()),
+            })
+
+        ranks = cugraph.pagerank(gpu_graph, alpha=alpha, max_iter=max_iter, tol=tol, nstart=nstart)
+        return dict(zip(ranks["vertex"].values_host.tolist(), ranks["pagerank"].values_host.tolist()))
+
+    def project_pagerank(self, project_id: int, graph: LinkGraphCSR) -> Dict[int, float]:
+        """
+        Get PageRank for a project graph, reusing the last result if the links are unchanged.
+
+        PageRank only depends on the nodes and edges, so page attributes
+        (titles, scores) may change without invalidating the cached ranks.
+        When the links did change, the previous ranks seed the new iteration.
+
+        Args:
+            project_id: Project ID
+            graph: Freshly built project graph
+
+        Returns:
+            Dict mapping page ID to PageRank
+        """
+        structure = graph.structure_digest()
+        with self._pagerank_cache_lock:
+            cached = self._pagerank_cache.get(project_id)
+            if cached is not None:
+                self._pagerank_cache.move_to_end(project_id)
+        if cached is not None and cached[0] == structure:
+            return cached[1]
+
+        # Links changed: iterate from the previous ranks instead of from scratch
+        # (from the shared snapshot when this process has not ranked the project yet)
+        previous = cached[1] if cached else self._load_rank_snapshot(project_id)
+        pagerank = self.calculate_pagerank(graph, initial=previous)
+        with self._pagerank_cache_lock:
+            self._pagerank_cache[project_id] = (structure, pagerank)
+            self._pagerank_cache.move_to_end(project_id)
+            while len(self._pagerank_cache) > PAGERANK_CACHE_SIZE:
+                self._pagerank_cache.popitem(last=False)
+        self._save_rank_snapshot(project_id, pagerank)
+        return pagerank
+
+    def _load_rank_snapshot(self, project_id: int) -> Optional[Dict[int, float]]:
+        """
+        Load the last PageRank saved for a project by any worker.
+
+        Args:
+            project_id: Project ID
+
+        Returns:
+            Dict mapping page ID to PageRank, or None if unavailable
+        """
+        try:
+            snapshot = get_sync_redis().get(f"{PAGERANK_SNAPSHOT_PREFIX}:{project_id}")
+        except Exception as e:
+            print(f"PageRank snapshot not loaded: {e}")
+            return None
+        if not snapshot:
+            return None
+        return {int(page_id): rank for page_id, rank in orjson.loads(snapshot).items()}
+
+    def _save_rank_snapshot(self, project_id: int, pagerank: Dict[int, float]) -> None:
+        """
+        Save a project's PageRank so later runs in any worker can warm-start from it.
+
+        Args:
+            project_id: Project ID
+            pagerank: Dict mapping page ID to PageRank
+        """
+        try:
+            get_sync_redis().setex(
+                f"{PAGERANK_SNAPSHOT_PREFIX}:{project_id}",
+                PAGERANK_SNAPSHOT_TTL,
+                orjson.dumps(pagerank, option=orjson.OPT_NON_STR_KEYS),
+            )
+        except Exception as e:
+            print(f"PageRank snapshot not saved: {e}")
+
+    def find_orphan_pages(self, graph: LinkGraphCSR) -> List[int]:
         """Find pages with no incoming links."""
-        orphans = []
-        for node in G.nodes():
-            if G.in_degree(node) == 0:
-                orphans.append(node)
-        return orphans
+        return graph.page_ids[graph.in_degree == 0].tolist()
 
     def find_hub_pages(
         self,
-        G: nx.DiGraph,
+        graph: LinkGraphCSR,
         top_n: int = 10
     ) -> List[tuple[int, int]]:
         """Find pages with many outgoing links."""
-        hubs = [(node, G.out_degree(node)) for node in G.nodes()]
-        hubs.sort(key=lambda x: x[1], reverse=True)
-        return hubs[:top_n]
+        # Stable sort keeps ties in page order
+        top = np.argsort(-graph.out_degree, kind='stable')[:top_n]
+        return list(zip(graph.page_ids[top].tolist(), graph.out_degree[top].tolist()))
 
     def find_authority_pages(
         self,
-        G: nx.DiGraph,
+        graph: LinkGraphCSR,
         pagerank: Dict[int, float],
         top_n: int = 10
     ) -> List[tuple[int, float]]:
         """Find pages with high PageRank."""
-        authorities = [(node, pagerank.get(node, 0)) for node in G.nodes()]
-        authorities.sort(key=lambda x: x[1], reverse=True)
-        return authorities[:top_n]
+        page_ids = graph.page_ids.tolist()
+        ranks = np.fromiter((pagerank.get(page_id, 0) for page_id in page_ids), np.float64, len(page_ids))
+        top = np.argsort(-ranks, kind='stable')[:top_n]
+        return list(zip(graph.page_ids[top].tolist(), ranks[top].tolist()))
 
     def get_graph_stats(
         self,
@@ -154,9 +473,9 @@ class LinkGraphService:
     ) -> GraphStats:
         """Get comprehensive statistics about the link graph."""
         # Build graph
-        G = self.build_graph(db, project_id)
+        graph = self.build_graph(db, project_id)
 
-        if len(G.nodes()) == 0:
+        if graph.num_pages == 0:
             return GraphStats(
                 total_pages=0,
                 total_links=0,
@@ -167,16 +486,17 @@ class LinkGraphService:
             )
 
         # Calculate metrics
-        pagerank = self.calculate_pagerank(G)
-        orphans = self.find_orphan_pages(G)
-        hubs = self.find_hub_pages(G, top_n=10)
-        authorities = self.find_authority_pages(G, pagerank, top_n=10)
+        pagerank = self.project_pagerank(project_id, graph)
+        orphans = self.find_orphan_pages(graph)
+        hubs = self.find_hub_pages(graph, top_n=10)
+        authorities = self.find_authority_pages(graph, pagerank, top_n=10)
 
         # Get page details for hubs and authorities
         page_ids = [h[0] for h in hubs] + [a[0] for a in authorities]
         pages_dict = {
             p.id: p for p in db.query(Page).filter(Page.id.in_(page_ids)).all()
         }
+        id_to_idx = graph.id_to_idx
 
         hub_pages = []
         for page_id, out_degree in hubs:
@@ -189,7 +509,7 @@ class LinkGraphService:
                     seo_score=page.seo_score or 0,
                     depth=page.depth,
                     pagerank=pagerank.get(page.id, 0),
-                    in_degree=G.in_degree(page.id),
+                    in_degree=int(graph.in_degree[id_to_idx[page.id]]),
                     out_degree=out_degree
                 ))
 
@@ -204,14 +524,14 @@ class LinkGraphService:
                     seo_score=page.seo_score or 0,
                     depth=page.depth,
                     pagerank=pr_score,
-                    in_degree=G.in_degree(page.id),
-                    out_degree=G.out_degree(page.id)
+                    in_degree=int(graph.in_degree[id_to_idx[page.id]]),
+                    out_degree=int(graph.out_degree[id_to_idx[page.id]])
                 ))
 
         return GraphStats(
-            total_pages=len(G.nodes()),
-            total_links=len(G.edges()),
-            avg_links_per_page=len(G.edges()) / len(G.nodes()) if len(G.nodes()) > 0 else 0,
+            total_pages=graph.num_pages,
+            total_links=graph.num_links,
+            avg_links_per_page=graph.num_links / graph.num_pages if graph.num_pages > 0 else 0,
             orphan_pages=len(orphans),
             hub_pages=hub_pages,
             authority_pages=authority_pages
@@ -223,29 +543,36 @@ class LinkGraphService:
         project_id: int
     ) -> Dict[str, Any]:
         """Export graph data for D3.js or Cytoscape visualization."""
-        G = self.build_graph(db, project_id)
-        pagerank = self.calculate_pagerank(G)
-
-        nodes = []
-        for node_id in G.nodes():
-            node_data = G.nodes[node_id]
-            nodes.append({
-                "id": node_id,
-                "label": node_data.get("title", "")[:50],
-                "url": node_data.get("url", ""),
-                "seo_score": node_data.get("seo_score", 0),
-                "depth": node_data.get("depth", 0),
-                "pagerank": pagerank.get(node_id, 0),
-                "in_degree": G.in_degree(node_id),
-                "out_degree": G.out_degree(node_id)
-            })
+        graph = self.build_graph(db, project_id)
+        pagerank = self.project_pagerank(project_id, graph)
+
+        nodes = [
+            {
+                "id": page_id,
+                "label": title[:50],
+                "url": url,
+                "seo_score": seo_score,
+                "depth": depth,
+                "pagerank": pagerank.get(page_id, 0),
+                "in_degree": in_degree,
+                "out_degree": out_degree
+            }
+            for page_id, title, url, seo_score, depth, in_degree, out_degree in zip(
+                graph.page_ids.tolist(),
+                graph.titles,
+                graph.urls,
+                graph.seo_scores.tolist(),
+                graph.depths.tolist(),
+                graph.in_degree.tolist(),
+                graph.out_degree.tolist(),
+            )
+        ]
 
-        edges = []
-        for source, target in G.edges():
-            edges.append({
-                "source": source,
-                "target": target
-            })
+        sources, targets = graph.edge_ids()
+        edges = [
+            {"source": source, "target": target}
+            for source, target in zip(sources.tolist(), targets.tolist())
+        ]
 
         return {
             "nodes": nodes,
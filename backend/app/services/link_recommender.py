@@ -1,15 +1,42 @@
 """Link recommendation service for internal linking optimization."""
 
-from typing import List, Dict, Any, Optional
+import heapq
+import threading
+from bisect import bisect_left
+from operator import attrgetter, itemgetter
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, NamedTuple, Tuple
 from dataclasses import dataclass
 from sqlalchemy import select, and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 import re
 
 from app.models.page import Page
 from app.services.keyword_extractor import keyword_extractor
 
 
+# Page columns read from candidate target pages
+TARGET_PAGE_COLUMNS = (
+    Page.id,
+    Page.url,
+    Page.title,
+    Page.h1,
+    Page.meta_description,
+    Page.text_content,
+    Page.seo_score,
+    Page.depth,
+    Page.content_hash,
+)
+
+# Anchor tag markers looked for around keyword positions
+ANCHOR_OPEN_PATTERN = re.compile(re.escape('<a '))
+ANCHOR_CLOSE_PATTERN = re.compile(re.escape('</a>'))
+
+# Lowercased target texts kept between requests (keyed by page ID and content hash),
+# bounded by total characters so a few very large pages cannot pin unbounded memory
+LOWERED_TEXT_CACHE_CHARS = 32_000_000
+
+
 @dataclass
 class LinkSuggestion:
     """Represents a link recommendation."""
@@ -25,12 +52,32 @@ class LinkSuggestion:
     reason: str  # Why this link is recommended
 
 
+class AnchorTags(NamedTuple):
+    """Positions of anchor tags in a source page's HTML, computed once per request."""
+    opening: List[int]
+    closing: List[int]
+    html_length: int
+
+
+class LoweredPage(NamedTuple):
+    """Lowercased searchable fields of a target page, computed once per request."""
+    page: Page
+    title: str
+    h1: str
+    meta_description: str
+    content: str
+    seo_bonus: float  # Keyword-independent score for a high SEO score
+
+
 class LinkRecommender:
     """Service for generating internal link recommendations."""
 
     def __init__(self):
         """Initialize the link recommender."""
-        pass
+        # Least recently used entry first; shared by request threads, so guarded by a lock
+        self._lowered_texts: OrderedDict[Tuple[int, str], str] = OrderedDict()
+        self._lowered_chars = 0
+        self._lowered_lock = threading.Lock()
 
     def get_recommendations(
         self,
@@ -62,8 +109,11 @@ class LinkRecommender:
             top_n=30
         )
 
-        # Get all pages in the same project (potential targets)
-        target_pages = db.query(Page).filter(
+        # Get all pages in the same project (potential targets), loading only
+        # the columns used for matching (rendered HTML is only read for the source)
+        target_pages = db.query(Page).options(
+            load_only(*TARGET_PAGE_COLUMNS)
+        ).filter(
             and_(
                 Page.project_id == project_id,
                 Page.id != page_id,
@@ -73,25 +123,34 @@ class LinkRecommender:
 
         suggestions = []
 
+        # Lowercase every target's text once, not once per keyword
+        lowered_targets = self._lowercase_targets(target_pages)
+        source_text_lower = source_page.text_content.lower()
+        anchor_tags = self._anchor_tags(source_page)
+
         # For each keyword, find relevant target pages
         for keyword, keyword_score in keywords:
+            # Find where the keyword appears in source page (same for every target)
+            positions = self._find_keyword_positions(
+                source_text_lower,
+                keyword,
+                limit=2  # Max 2 positions per keyword
+            )
+            if not positions:
+                continue
+
             # Find pages that match this keyword
             matching_pages = self._find_matching_pages(
                 keyword,
-                target_pages,
-                source_page
+                lowered_targets,
+                source_page,
+                top_n=3  # Top 3 per keyword
             )
 
-            for target_page, relevance_score in matching_pages[:3]:  # Top 3 per keyword
-                # Find where the keyword appears in source page
-                positions = self._find_keyword_positions(
-                    source_page.text_content,
-                    keyword
-                )
-
-                for pos in positions[:2]:  # Max 2 positions per keyword
+            for target_page, relevance_score in matching_pages:
+                for pos in positions:
                     # Check if there's already a link near this position
-                    if self._has_nearby_link(source_page, pos):
+                    if self._has_nearby_link(anchor_tags, pos):
                         continue
 
                     # Extract context around the keyword
@@ -121,66 +180,141 @@ class LinkRecommender:
                         reason=f"Content similarity on '{keyword}'"
                     ))
 
-        # Sort by score and return top suggestions
-        suggestions.sort(key=lambda x: x.score, reverse=True)
-        return suggestions[:max_suggestions]
+        # Return top suggestions by score
+        return heapq.nlargest(max_suggestions, suggestions, key=attrgetter('score'))
+
+    def _lowercase_targets(self, target_pages: List[Page]) -> List[LoweredPage]:
+        """
+        Lowercase the searchable fields of each target page once.
+
+        Args:
+            target_pages: Candidate target pages
+
+        Returns:
+            Lowered views of the pages that have text content
+        """
+        return [
+            LoweredPage(
+                page=page,
+                title=page.title.lower() if page.title else "",
+                h1=page.h1.lower() if page.h1 else "",
+                meta_description=page.meta_description.lower() if page.meta_description else "",
+                content=self._lowered_text(page),
+                seo_bonus=(page.seo_score / 100.0) * 0.2 if page.seo_score else 0.0,
+            )
+            for page in target_pages
+            if page.text_content
+        ]
+
+    def _lowered_text(self, page: Page) -> str:
+        """
+        Get a page's lowercased text, reusing it while the content is unchanged.
+
+        Recommendations for several pages of a project scan the same targets,
+        so each target's text is lowercased once rather than once per request.
+
+        Args:
+            page: Target page with text content
+
+        Returns:
+            Lowercased text content
+        """
+        if not page.content_hash:
+            return page.text_content.lower()
+
+        key = (page.id, page.content_hash)
+        with self._lowered_lock:
+            lowered = self._lowered_texts.get(key)
+            if lowered is not None:
+                self._lowered_texts.move_to_end(key)
+                return lowered
+
+        lowered = page.text_content.lower()
+        if len(lowered) > LOWERED_TEXT_CACHE_CHARS:
+            return lowered
+
+        with self._lowered_lock:
+            previous = self._lowered_texts.pop(key, None)
+            if previous is not None:
+                self._lowered_chars -= len(previous)
+            self._lowered_texts[key] = lowered
+            self._lowered_chars += len(lowered)
+            while self._lowered_chars > LOWERED_TEXT_CACHE_CHARS:
+                _, evicted = self._lowered_texts.popitem(last=False)
+                self._lowered_chars -= len(evicted)
+        return lowered
 
     def _find_matching_pages(
         self,
         keyword: str,
-        target_pages: List[Page],
-        source_page: Page
+        lowered_targets: List[LoweredPage],
+        source_page: Page,
+        top_n: Optional[int] = None
     ) -> List[tuple[Page, float]]:
-        """Find pages that match the keyword."""
+        """Find pages that match the keyword, best first (top_n best if given)."""
         matches = []
 
         keyword_lower = keyword.lower()
 
-        for page in target_pages:
-            if not page.text_content:
-                continue
+        for target in lowered_targets:
+            page = target.page
 
             # Calculate relevance score
             score = 0.0
 
             # Check in title (highest weight)
-            if page.title and keyword_lower in page.title.lower():
+            if keyword_lower in target.title:
                 score += 0.5
 
             # Check in H1
-            if page.h1 and keyword_lower in page.h1.lower():
+            if keyword_lower in target.h1:
                 score += 0.3
 
             # Check in meta description
-            if page.meta_description and keyword_lower in page.meta_description.lower():
+            if keyword_lower in target.meta_description:
                 score += 0.2
 
             # Check in content (count occurrences)
-            content_lower = page.text_content.lower()
-            occurrence_count = content_lower.count(keyword_lower)
+            occurrence_count = target.content.count(keyword_lower)
             # Normalize by content length
             if occurrence_count > 0:
                 score += min(occurrence_count / 10.0, 0.5)
 
             # Bonus for high SEO score
-            if page.seo_score:
-                score += (page.seo_score / 100.0) * 0.2
+            if target.seo_bonus:
+                score += target.seo_bonus
 
             if score > 0:
                 matches.append((page, score))
 
-        # Sort by relevance
-        matches.sort(key=lambda x: x[1], reverse=True)
+        # Sort by relevance (partial selection when only the best few are used)
+        if top_n is not None:
+            return heapq.nlargest(top_n, matches, key=itemgetter(1))
+        matches.sort(key=itemgetter(1), reverse=True)
         return matches
 
-    def _find_keyword_positions(self, text: str, keyword: str) -> List[int]:
-        """Find all positions where keyword appears in text."""
+    def _find_keyword_positions(
+        self,
+        text_lower: str,
+        keyword: str,
+        limit: Optional[int] = None
+    ) -> List[int]:
+        """
+        Find positions where keyword appears in text.
+
+        Args:
+            text_lower: Lowercased text to search
+            keyword: Keyword to find (case-insensitive)
+            limit: Stop after this many positions (default: all)
+
+        Returns:
+            Start positions of non-overlapping occurrences
+        """
         positions = []
-        text_lower = text.lower()
         keyword_lower = keyword.lower()
 
         start = 0
-        while True:
+        while limit is None or len(positions) < limit:
             pos = text_lower.find(keyword_lower, start)
             if pos == -1:
                 break
@@ -189,17 +323,37 @@ class LinkRecommender:
 
         return positions
 
-    def _has_nearby_link(self, page: Page, position: int, radius: int = 100) -> bool:
-        """Check if there's already a link near this position."""
-        # Simple heuristic: check if <a> tag exists nearby
-        if not page.rendered_html:
-            return False
+    def _anchor_tags(self, page: Page) -> AnchorTags:
+        """
+        Locate every anchor tag in a page's HTML once.
 
-        start = max(0, position - radius)
-        end = min(len(page.rendered_html), position + radius)
-        snippet = page.rendered_html[start:end]
+        Args:
+            page: Source page
 
-        return '<a ' in snippet or '</a>' in snippet
+        Returns:
+            Sorted start positions of '<a ' and '</a>', and the HTML length
+        """
+        html = page.rendered_html or ""
+        return AnchorTags(
+            opening=[m.start() for m in ANCHOR_OPEN_PATTERN.finditer(html)],
+            closing=[m.start() for m in ANCHOR_CLOSE_PATTERN.finditer(html)],
+            html_length=len(html),
+        )
+
+    def _has_nearby_link(self, anchor_tags: AnchorTags, position: int, radius: int = 100) -> bool:
+        """Check if there's already a link near this position."""
+        # Simple heuristic: an <a> tag lies entirely within radius of the position
+        start = max(0, position - radius)
+        end = min(anchor_tags.html_length, position + radius)
+
+        for tag_starts, tag_length in (
+            (anchor_tags.opening, len('<a ')),
+            (anchor_tags.closing, len('</a>')),
+        ):
+            i = bisect_left(tag_starts, start)
+            if i < len(tag_starts) and tag_starts[i] + tag_length <= end:
+                return True
+        return False
 
     def _extract_context(
         self,
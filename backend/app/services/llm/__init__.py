@@ -12,6 +12,7 @@ from app.services.llm.base import (
     LLMContentFilterException,
 )
 from app.services.llm.factory import LLMFactory
+from app.services.llm.rate_limiter import TokenBucket, get_token_bucket
 from app.services.llm.openai_adapter import OpenAIAdapter
 from app.services.llm.anthropic_adapter import AnthropicAdapter
 from app.services.llm.huggingface_adapter import HuggingFaceAdapter
@@ -27,6 +28,8 @@ __all__ = [
     "LLMAuthenticationException",
     "LLMContentFilterException",
     "LLMFactory",
+    "TokenBucket",
+    "get_token_bucket",
     "OpenAIAdapter",
     "AnthropicAdapter",
     "HuggingFaceAdapter",
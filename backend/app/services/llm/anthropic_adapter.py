@@ -12,7 +12,9 @@ from app.services.llm.base import (
     LLMException,
     LLMRateLimitException,
     LLMAuthenticationException,
+    parse_retry_after,
 )
+from app.services.llm.http_client import get_http_client
 
 
 class AnthropicAdapter(BaseLLMAdapter):
@@ -39,7 +41,7 @@ class AnthropicAdapter(BaseLLMAdapter):
     def __init__(self, api_key: str, config: Optional[Dict[str, Any]] = None):
         """Initialize Anthropic adapter."""
         super().__init__(api_key, config)
-        self.client = AsyncAnthropic(api_key=api_key)
+        self.client = AsyncAnthropic(api_key=api_key, http_client=get_http_client())
 
     def _get_provider(self) -> LLMProvider:
         """Get provider type."""
@@ -111,6 +113,7 @@ class AnthropicAdapter(BaseLLMAdapter):
                 message="Anthropic rate limit exceeded",
                 provider=self.provider.value,
                 original_error=e,
+                retry_after=parse_retry_after(e.response.headers),
             )
         except AuthenticationError as e:
             raise LLMAuthenticationException(
@@ -152,7 +155,7 @@ class AnthropicAdapter(BaseLLMAdapter):
         response = await self.generate(messages, config)
         return response.content
 
-    async def count_tokens(self, text: str) -> int:
+    async def count_tokens(self, text: str, model: Optional[str] = None) -> int:
         """
         Estimate token count for text.
 
@@ -160,6 +163,7 @@ class AnthropicAdapter(BaseLLMAdapter):
 
         Args:
             text: Text to count
+            model: Model whose tokenizer applies (defaults to the adapter's model)
 
         Returns:
             Estimated token count
@@ -1,11 +1,16 @@
 """Base LLM adapter interface implementing Strategy pattern."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
 
+# Requests in flight per generate_batch call (provider rate limits still apply)
+BATCH_CONCURRENCY = 8
+
+
 class LLMProvider(str, Enum):
     """Supported LLM providers."""
 
@@ -45,6 +50,8 @@ class LLMConfig:
     frequency_penalty: float = 0.0
     presence_penalty: float = 0.0
     stop: Optional[List[str]] = None
+    seed: Optional[int] = None  # Deterministic sampling where supported
+    json_mode: bool = False  # Ask for a JSON object response where supported
 
 
 class BaseLLMAdapter(ABC):
@@ -115,13 +122,55 @@ class BaseLLMAdapter(ABC):
         """
         pass
 
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        config: Optional[LLMConfig] = None,
+        concurrency: int = BATCH_CONCURRENCY,
+    ) -> List[str]:
+        """
+        Generate text for several prompts concurrently.
+
+        If any generation fails, the remaining ones are cancelled and the
+        first LLMException is raised, unwrapped from the task group.
+
+        Args:
+            prompts: User prompts
+            system_prompt: Optional system instructions shared by all prompts
+            config: Generation configuration
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Generated text for each prompt, in prompt order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate_one(prompt: str) -> str:
+            async with semaphore:
+                return await self.generate_text(prompt, system_prompt=system_prompt, config=config)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(generate_one(prompt)) for prompt in prompts]
+        except ExceptionGroup as errors:
+            # Callers handle provider errors as LLMException, not as a group
+            error = next(
+                (e for e in errors.exceptions if isinstance(e, LLMException)),
+                errors.exceptions[0],
+            )
+            raise error from errors
+
+        return [task.result() for task in tasks]
+
     @abstractmethod
-    async def count_tokens(self, text: str) -> int:
+    async def count_tokens(self, text: str, model: Optional[str] = None) -> int:
         """
         Count tokens in text.
 
         Args:
             text: Text to count
+            model: Model whose tokenizer applies (defaults to the adapter's model)
 
         Returns:
             Number of tokens
@@ -181,7 +230,38 @@ class LLMException(Exception):
 class LLMRateLimitException(LLMException):
     """Raised when LLM rate limit is exceeded."""
 
-    pass
+    def __init__(
+        self,
+        message: str,
+        provider: Optional[str] = None,
+        original_error: Optional[Exception] = None,
+        retry_after: Optional[float] = None,
+    ):
+        self.retry_after = retry_after
+        super().__init__(message, provider=provider, original_error=original_error)
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Parse a Retry-After header value in seconds.
+
+    Args:
+        headers: Response headers mapping (may be None)
+
+    Returns:
+        Delay in seconds, or None if absent or not numeric
+    """
+    if not headers:
+        return None
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
 
 
 class LLMAuthenticationException(LLMException):
@@ -1,12 +1,25 @@
 """LLM factory implementing Strategy pattern."""
 
-from typing import Dict, Any, Optional
+import hashlib
+from typing import Dict, Any, Optional, Tuple, Type
 from app.services.llm.base import BaseLLMAdapter, LLMProvider
 from app.services.llm.openai_adapter import OpenAIAdapter
 from app.services.llm.anthropic_adapter import AnthropicAdapter
 from app.services.llm.huggingface_adapter import HuggingFaceAdapter
 
 
+# Adapter class per provider name
+_ADAPTERS: Dict[str, Type[BaseLLMAdapter]] = {
+    LLMProvider.OPENAI.value: OpenAIAdapter,
+    LLMProvider.ANTHROPIC.value: AnthropicAdapter,
+    LLMProvider.HUGGINGFACE.value: HuggingFaceAdapter,
+}
+
+# Adapters cached per (provider, api key hash) so SDK clients and their
+# connection pools are reused across requests
+_adapter_cache: Dict[Tuple[str, str], BaseLLMAdapter] = {}
+
+
 class LLMFactory:
     """
     Factory for creating LLM adapters based on provider.
@@ -23,6 +36,9 @@ class LLMFactory:
         """
         Create an LLM adapter instance based on provider.
 
+        Adapters created without custom config are memoized per provider and
+        API key, so repeated calls share one SDK client and connection pool.
+
         Args:
             provider: Provider name ("openai", "anthropic", "huggingface")
             api_key: API key for the provider
@@ -36,21 +52,31 @@ class LLMFactory:
         """
         provider_lower = provider.lower()
 
-        if provider_lower == LLMProvider.OPENAI.value:
-            return OpenAIAdapter(api_key=api_key, config=config)
+        cache_key = None
+        if config is None:
+            cache_key = (provider_lower, hashlib.sha256(api_key.encode()).hexdigest())
+            cached = _adapter_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-        elif provider_lower == LLMProvider.ANTHROPIC.value:
-            return AnthropicAdapter(api_key=api_key, config=config)
-
-        elif provider_lower == LLMProvider.HUGGINGFACE.value:
-            return HuggingFaceAdapter(api_key=api_key, config=config)
-
-        else:
+        adapter_class = _ADAPTERS.get(provider_lower)
+        if adapter_class is None:
             raise ValueError(
                 f"Unknown LLM provider: {provider}. "
                 f"Use one of: {', '.join([p.value for p in LLMProvider])}"
             )
 
+        adapter = adapter_class(api_key=api_key, config=config)
+        if cache_key is not None:
+            _adapter_cache[cache_key] = adapter
+
+        return adapter
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached adapter instances."""
+        _adapter_cache.clear()
+
     @staticmethod
     def get_available_providers() -> list[str]:
         """
@@ -75,16 +101,8 @@ class LLMFactory:
         Raises:
             ValueError: If provider is unknown
         """
-        provider_lower = provider.lower()
-
-        if provider_lower == LLMProvider.OPENAI.value:
-            return OpenAIAdapter.MODELS
-
-        elif provider_lower == LLMProvider.ANTHROPIC.value:
-            return AnthropicAdapter.MODELS
-
-        elif provider_lower == LLMProvider.HUGGINGFACE.value:
-            return HuggingFaceAdapter.MODELS
-
-        else:
+        adapter_class = _ADAPTERS.get(provider.lower())
+        if adapter_class is None:
             raise ValueError(f"Unknown LLM provider: {provider}")
+
+        return adapter_class.MODELS
@@ -0,0 +1,40 @@
+"""Shared HTTP connection pool for LLM provider clients."""
+
+from typing import Optional
+import httpx
+
+
+# Connection pool limits shared by every LLM provider client
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Process-wide async HTTP client (keeps TCP/TLS connections alive between calls)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client used by LLM adapters.
+
+    HTTP/2 lets concurrent requests to the same provider multiplex over a
+    single connection instead of opening one TLS session per call.
+
+    Returns:
+        httpx.AsyncClient: Pooled HTTP client
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
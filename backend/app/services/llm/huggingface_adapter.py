@@ -2,6 +2,7 @@
 
 from typing import List, Optional, Dict, Any
 import httpx
+import orjson
 
 from app.services.llm.base import (
     BaseLLMAdapter,
@@ -12,7 +13,9 @@ from app.services.llm.base import (
     LLMException,
     LLMRateLimitException,
     LLMAuthenticationException,
+    parse_retry_after,
 )
+from app.services.llm.http_client import get_http_client
 
 
 class HuggingFaceAdapter(BaseLLMAdapter):
@@ -68,63 +71,62 @@ class HuggingFaceAdapter(BaseLLMAdapter):
         prompt = self._messages_to_prompt(messages, config.model)
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.API_URL}/{config.model}",
-                    headers=self.headers,
-                    json={
-                        "inputs": prompt,
-                        "parameters": {
-                            "max_new_tokens": config.max_tokens,
-                            "temperature": config.temperature,
-                            "top_p": config.top_p,
-                            "do_sample": True,
-                            "return_full_text": False,
-                        },
+            response = await get_http_client().post(
+                f"{self.API_URL}/{config.model}",
+                headers=self.headers,
+                json={
+                    "inputs": prompt,
+                    "parameters": {
+                        "max_new_tokens": config.max_tokens,
+                        "temperature": config.temperature,
+                        "top_p": config.top_p,
+                        "do_sample": True,
+                        "return_full_text": False,
                     },
-                    timeout=60.0,
-                )
+                },
+            )
 
-                if response.status_code == 401:
-                    raise LLMAuthenticationException(
-                        message="HuggingFace authentication failed",
-                        provider=self.provider.value,
-                    )
-                elif response.status_code == 429:
-                    raise LLMRateLimitException(
-                        message="HuggingFace rate limit exceeded",
-                        provider=self.provider.value,
-                    )
-                elif response.status_code != 200:
-                    raise LLMException(
-                        message=f"HuggingFace API error: {response.status_code} - {response.text}",
-                        provider=self.provider.value,
-                    )
-
-                result = response.json()
-
-                # Handle different response formats
-                if isinstance(result, list) and len(result) > 0:
-                    generated_text = result[0].get("generated_text", "")
-                elif isinstance(result, dict):
-                    generated_text = result.get("generated_text", "")
-                else:
-                    generated_text = str(result)
-
-                # Estimate tokens (rough)
-                tokens_used = await self.count_tokens(prompt + generated_text)
-
-                return LLMResponse(
-                    content=generated_text.strip(),
-                    model=config.model,
+            if response.status_code == 401:
+                raise LLMAuthenticationException(
+                    message="HuggingFace authentication failed",
+                    provider=self.provider.value,
+                )
+            elif response.status_code == 429:
+                raise LLMRateLimitException(
+                    message="HuggingFace rate limit exceeded",
+                    provider=self.provider.value,
+                    retry_after=parse_retry_after(response.headers),
+                )
+            elif response.status_code != 200:
+                raise LLMException(
+                    message=f"HuggingFace API error: {response.status_code} - {response.text}",
                     provider=self.provider.value,
-                    tokens_used=tokens_used,
-                    finish_reason="stop",  # HF doesn't always provide this
-                    metadata={
-                        "prompt": prompt,
-                    },
                 )
 
+            result = orjson.loads(response.content)
+
+            # Handle different response formats
+            if isinstance(result, list) and len(result) > 0:
+                generated_text = result[0].get("generated_text", "")
+            elif isinstance(result, dict):
+                generated_text = result.get("generated_text", "")
+            else:
+                generated_text = str(result)
+
+            # Estimate tokens (rough)
+            tokens_used = await self.count_tokens(prompt + generated_text, model=config.model)
+
+            return LLMResponse(
+                content=generated_text.strip(),
+                model=config.model,
+                provider=self.provider.value,
+                tokens_used=tokens_used,
+                finish_reason="stop",  # HF doesn't always provide this
+                metadata={
+                    "prompt": prompt,
+                },
+            )
+
         except httpx.HTTPError as e:
             raise LLMException(
                 message=f"HuggingFace HTTP error: {str(e)}",
@@ -207,12 +209,13 @@ class HuggingFaceAdapter(BaseLLMAdapter):
                 prompt_parts.append(f"{msg.role.capitalize()}: {msg.content}\n")
             return "\n".join(prompt_parts)
 
-    async def count_tokens(self, text: str) -> int:
+    async def count_tokens(self, text: str, model: Optional[str] = None) -> int:
         """
         Estimate token count for text.
 
         Args:
             text: Text to count
+            model: Model whose tokenizer applies (defaults to the adapter's model)
 
         Returns:
             Estimated token count
@@ -1,5 +1,6 @@
 """OpenAI LLM adapter."""
 
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from openai import AsyncOpenAI
 from openai import RateLimitError, AuthenticationError, APIError
@@ -13,7 +14,42 @@ from app.services.llm.base import (
     LLMException,
     LLMRateLimitException,
     LLMAuthenticationException,
+    parse_retry_after,
 )
+from app.services.llm.http_client import get_http_client
+
+try:
+    import tiktoken
+except ImportError:  # Token counts fall back to a character estimate
+    tiktoken = None
+
+
+# Encoding used for models tiktoken does not know about (all chat models above use it)
+FALLBACK_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=16)
+def _encoder(model: str):
+    """
+    Get the tiktoken encoding for a model, loaded once per process.
+
+    The first load downloads the BPE file; if that fails, None is cached and
+    token counts use the character estimate instead of failing requests.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        tiktoken Encoding, or None if it could not be loaded
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        print(f"tiktoken encoding unavailable for {model}: {e}")
+        return None
 
 
 class OpenAIAdapter(BaseLLMAdapter):
@@ -36,10 +72,17 @@ class OpenAIAdapter(BaseLLMAdapter):
 
     DEFAULT_MODEL = "gpt-3.5-turbo-1106"
 
+    # Models accepting response_format={"type": "json_object"}
+    JSON_MODE_MODELS = {
+        "gpt-4-turbo-preview",
+        "gpt-4-1106-preview",
+        "gpt-3.5-turbo-1106",
+    }
+
     def __init__(self, api_key: str, config: Optional[Dict[str, Any]] = None):
         """Initialize OpenAI adapter."""
         super().__init__(api_key, config)
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key, http_client=get_http_client())
 
     def _get_provider(self) -> LLMProvider:
         """Get provider type."""
@@ -66,6 +109,13 @@ class OpenAIAdapter(BaseLLMAdapter):
         # Convert messages to OpenAI format
         openai_messages = [{"role": msg.role, "content": msg.content} for msg in messages]
 
+        # Optional parameters only sent when requested
+        extra_params = {}
+        if config.seed is not None:
+            extra_params["seed"] = config.seed
+        if config.json_mode and config.model in self.JSON_MODE_MODELS:
+            extra_params["response_format"] = {"type": "json_object"}
+
         try:
             response = await self.client.chat.completions.create(
                 model=config.model,
@@ -76,6 +126,7 @@ class OpenAIAdapter(BaseLLMAdapter):
                 frequency_penalty=config.frequency_penalty,
                 presence_penalty=config.presence_penalty,
                 stop=config.stop,
+                **extra_params,
             )
 
             choice = response.choices[0]
@@ -97,6 +148,7 @@ class OpenAIAdapter(BaseLLMAdapter):
                 message="OpenAI rate limit exceeded",
                 provider=self.provider.value,
                 original_error=e,
+                retry_after=parse_retry_after(e.response.headers),
             )
         except AuthenticationError as e:
             raise LLMAuthenticationException(
@@ -138,21 +190,26 @@ class OpenAIAdapter(BaseLLMAdapter):
         response = await self.generate(messages, config)
         return response.content
 
-    async def count_tokens(self, text: str) -> int:
+    async def count_tokens(self, text: str, model: Optional[str] = None) -> int:
         """
-        Estimate token count for text.
+        Count tokens in text with the model's tiktoken encoding.
 
-        Uses rough estimation: ~4 characters per token for English.
+        Falls back to ~4 characters per token when tiktoken is not installed
+        or its encoding cannot be loaded.
 
         Args:
             text: Text to count
+            model: Model whose tokenizer applies (defaults to the adapter's model)
 
         Returns:
-            Estimated token count
+            Token count
         """
-        # Rough estimation for English text
-        # For accurate counting, use tiktoken library
-        return len(text) // 4
+        model = model or self.config.get("model", self.DEFAULT_MODEL)
+        encoder = _encoder(model) if tiktoken else None
+        if encoder is None:
+            return len(text) // 4
+
+        return len(encoder.encode(text, disallowed_special=()))
 
     def get_models(self) -> List[str]:
         """Get available OpenAI models."""
@@ -0,0 +1,89 @@
+"""Client-side rate limiting for outgoing LLM requests."""
+
+import asyncio
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    Async token bucket enforcing requests-per-minute and tokens-per-minute.
+
+    Both budgets refill continuously, so callers are released as soon as
+    capacity is available instead of bursting into provider 429 errors.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Initialize token bucket.
+
+        Args:
+            rpm: Maximum requests per minute
+            tpm: Maximum tokens per minute
+        """
+        if rpm < 1 or tpm < 1:
+            raise ValueError("rpm and tpm must be positive")
+
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add capacity proportional to the time elapsed since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    async def acquire(self, tokens_estimate: int = 0) -> None:
+        """
+        Wait until one request and the estimated tokens can be spent.
+
+        Args:
+            tokens_estimate: Estimated prompt + completion tokens for the call
+        """
+        # A single oversized request must still be able to go through
+        tokens_estimate = min(max(tokens_estimate, 0), self.tpm)
+
+        async with self._lock:
+            while True:
+                self._refill()
+
+                if self._requests >= 1 and self._tokens >= tokens_estimate:
+                    self._requests -= 1
+                    self._tokens -= tokens_estimate
+                    return
+
+                wait = max(
+                    (1 - self._requests) * 60.0 / self.rpm,
+                    (tokens_estimate - self._tokens) * 60.0 / self.tpm,
+                )
+                await asyncio.sleep(max(wait, 0.0))
+
+
+# Buckets shared by all callers of a given provider
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_token_bucket(provider: str, rpm: int, tpm: int) -> TokenBucket:
+    """
+    Get the process-wide token bucket for a provider.
+
+    Args:
+        provider: Provider name
+        rpm: Requests per minute (used when the bucket is first created)
+        tpm: Tokens per minute (used when the bucket is first created)
+
+    Returns:
+        TokenBucket for the provider
+    """
+    bucket = _buckets.get(provider)
+    if bucket is None:
+        bucket = TokenBucket(rpm=rpm, tpm=tpm)
+        _buckets[provider] = bucket
+    return bucket
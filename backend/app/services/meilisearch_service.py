@@ -302,5 +302,18 @@ class MeilisearchService:
             }
 
 
-# Singleton instance
-meilisearch_service = MeilisearchService()
+# Singleton instance (created on first use: initializing the index calls Meilisearch)
+_meilisearch_service: Optional[MeilisearchService] = None
+
+
+def get_meilisearch_service() -> MeilisearchService:
+    """
+    Get Meilisearch service instance, initializing the index on first call.
+
+    Returns:
+        MeilisearchService instance
+    """
+    global _meilisearch_service
+    if _meilisearch_service is None:
+        _meilisearch_service = MeilisearchService()
+    return _meilisearch_service
@@ -4,22 +4,32 @@ from typing import Optional
 from langdetect import detect, LangDetectException
 
 
+# Detection accuracy saturates after a few KB of text
+DETECTION_SAMPLE_LENGTH = 2000
+
+
 def detect_language(text: str) -> Optional[str]:
     """
     Detect the language of a text.
 
+    Only the first DETECTION_SAMPLE_LENGTH characters are analyzed.
+
     Args:
         text: Input text
 
     Returns:
         ISO 639-1 language code (e.g., "en", "fr") or None if detection fails
     """
-    if not text or len(text.strip()) < 20:
+    if not text:
+        return None
+
+    sample = text[:DETECTION_SAMPLE_LENGTH].strip()
+    if len(sample) < 20:
         return None
 
     try:
         # langdetect returns ISO 639-1 codes
-        return detect(text)
+        return detect(sample)
     except LangDetectException:
         return None
 
@@ -13,6 +13,41 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.webhook import Webhook, WebhookDelivery
 
 
+# Connection pool shared by all webhook deliveries (keep-alive + HTTP/2)
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Process-wide async HTTP client
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client used for webhook deliveries.
+
+    Repeated deliveries to the same endpoint reuse pooled connections
+    instead of paying a TCP/TLS handshake per request.
+
+    Returns:
+        httpx.AsyncClient: Pooled HTTP client
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=HTTP_LIMITS,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared webhook HTTP client."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class WebhookDeliveryService:
     """
     Service for delivering webhook notifications.
@@ -69,12 +104,12 @@ class WebhookDeliveryService:
         # Send request
         start_time = datetime.utcnow()
         try:
-            async with httpx.AsyncClient(timeout=webhook.timeout) as client:
-                response = await client.post(
-                    webhook.url,
-                    json=payload,
-                    headers=headers,
-                )
+            response = await get_http_client().post(
+                webhook.url,
+                json=payload,
+                headers=headers,
+                timeout=webhook.timeout,
+            )
 
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
 
@@ -168,12 +203,12 @@ class WebhookDeliveryService:
         # Send request
         start_time = datetime.utcnow()
         try:
-            async with httpx.AsyncClient(timeout=webhook.timeout) as client:
-                response = await client.post(
-                    webhook.url,
-                    json=delivery.payload,
-                    headers=headers,
-                )
+            response = await get_http_client().post(
+                webhook.url,
+                json=delivery.payload,
+                headers=headers,
+                timeout=webhook.timeout,
+            )
 
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
 
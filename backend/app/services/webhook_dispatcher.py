@@ -33,6 +33,9 @@ class WebhookDispatcher:
         "tree.generated": "Site tree generated",
     }
 
+    # Maximum webhook deliveries in flight per dispatched event
+    MAX_CONCURRENT_DELIVERIES = 10
+
     def __init__(self, db: AsyncSession):
         """
         Initialize webhook dispatcher.
@@ -88,16 +91,19 @@ class WebhookDispatcher:
         # Enrich payload with standard fields
         enriched_payload = self._enrich_payload(payload, event_type, tenant_id)
 
-        # Deliver to all subscribed webhooks asynchronously
-        delivery_tasks = [
-            self.delivery_service.deliver(
-                webhook=webhook,
-                event_type=event_type,
-                payload=enriched_payload,
-                event_id=event_id,
-            )
-            for webhook in subscribed_webhooks
-        ]
+        # Deliver to all subscribed webhooks asynchronously (bounded concurrency)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_DELIVERIES)
+
+        async def bounded_deliver(webhook: Webhook):
+            async with semaphore:
+                return await self.delivery_service.deliver(
+                    webhook=webhook,
+                    event_type=event_type,
+                    payload=enriched_payload,
+                    event_id=event_id,
+                )
+
+        delivery_tasks = [bounded_deliver(webhook) for webhook in subscribed_webhooks]
 
         deliveries = await asyncio.gather(*delivery_tasks, return_exceptions=True)
 
@@ -86,8 +86,11 @@ def crawl_site(job_id: int) -> dict:
         # Run crawler (async)
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        crawl_result = loop.run_until_complete(crawler.crawl())
-        loop.close()
+        try:
+            crawl_result = loop.run_until_complete(crawler.crawl())
+        finally:
+            loop.run_until_complete(crawler.close())
+            loop.close()
 
         # Save pages to database
         from app.services.seo_analyzer import seo_analyzer
@@ -157,7 +160,9 @@ def crawl_site(job_id: int) -> dict:
 
         # Index pages to Meilisearch for full-text search
         try:
-            from app.services.meilisearch_service import meilisearch_service
+            from app.services.meilisearch_service import get_meilisearch_service
+
+            meilisearch_service = get_meilisearch_service()
 
             # Get all pages for this crawl job to index
             pages_to_index = db.query(Page).filter(Page.crawl_job_id == job.id).all()
@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app.core.database import SessionLocal
 from app.models.page import Page
-from app.services.meilisearch_service import meilisearch_service
+from app.services.meilisearch_service import get_meilisearch_service
 
 
 def reindex_all_pages():
@@ -52,6 +52,8 @@ def reindex_all_pages():
 
         print(f"Indexing in {total_batches} batch(es)...")
 
+        meilisearch_service = get_meilisearch_service()
+
         for i in range(0, len(documents), batch_size):
             batch = documents[i:i + batch_size]
             batch_num = i // batch_size + 1
@@ -0,0 +1,113 @@
+"""Tests for shared crawler parsing helpers."""
+
+import asyncio
+
+from app.services.crawler.fast_crawler import FastCrawler
+
+
+HTML = """
+<html lang="en-US">
+<head>
+    <title>Test Page</title>
+    <meta name="description" content="A description">
+    <link rel="canonical" href="https://example.com/canonical">
+    <link rel="alternate" hreflang="fr" href="https://example.com/fr">
+</head>
+<body>
+    <h1>Main <b>Title</b></h1>
+    <script>var ignored = true;</script>
+    <p>Hello world</p>
+    <a href="/about">About</a>
+    <a href="https://other.com/">External</a>
+</body>
+</html>
+"""
+
+
+def make_crawler() -> FastCrawler:
+    """Create a crawler for parsing tests."""
+    return FastCrawler({"start_url": "https://example.com/"})
+
+
+def test_extract_page_data():
+    """Test SEO fields are extracted from HTML."""
+    data = make_crawler()._extract_page_data("https://example.com/", HTML)
+
+    assert data["title"] == "Test Page"
+    assert data["meta_description"] == "A description"
+    assert data["meta_keywords"] is None
+    assert data["h1"] == "MainTitle"
+    assert data["lang"] == "en"
+    assert data["canonical_url"] == "https://example.com/canonical"
+    assert data["hreflang"] == {"fr": "https://example.com/fr"}
+    assert data["outgoing_links"] == ["https://example.com/about"]
+    assert "ignored" not in data["text_content"]
+    assert "Hello world" in data["text_content"]
+    assert data["text_content"] == "Test Page Main Title Hello world About External"
+
+
+def test_score_url_downranks_pagination():
+    """Test pagination and faceted URLs are scheduled last."""
+    crawler = make_crawler()
+
+    assert crawler._score_url("https://example.com/blog/post") == 0
+    assert crawler._score_url("https://example.com/blog?page=2") == 1
+    assert crawler._score_url("https://example.com/blog/page/3") == 1
+    assert crawler._score_url("https://example.com/shop?color=red&sort=price") == 1
+
+
+def test_should_crawl_url_skips_resources():
+    """Test non-HTML resources are filtered by extension."""
+    crawler = make_crawler()
+
+    assert crawler._should_crawl_url("https://example.com/page") is True
+    assert crawler._should_crawl_url("https://example.com/v1.2/docs") is True
+    assert crawler._should_crawl_url("https://example.com/file.PDF") is False
+    assert crawler._should_crawl_url("https://example.com/style.css?v=3") is False
+    assert crawler._should_crawl_url("") is False
+
+
+def test_extract_page_data_caps_outgoing_links():
+    """Test outgoing links are capped per page."""
+    crawler = FastCrawler({"start_url": "https://example.com/", "max_links_per_page": 3})
+    html = "<body>" + "".join(f'<a href="/p{i}">{i}</a>' for i in range(10)) + "</body>"
+
+    data = crawler._extract_page_data("https://example.com/", html)
+
+    assert len(data["outgoing_links"]) == 3
+    assert data["word_count"] == 10
+
+
+async def test_crawl_resets_state_between_runs():
+    """Test a reused crawler starts each crawl with empty results."""
+    crawler = make_crawler()
+    runs = []
+
+    async def run_queue(workers):
+        runs.append((len(crawler.pages), len(crawler._enqueued)))
+        crawler._enqueue(asyncio.PriorityQueue(), crawler.start_url, 0)
+        crawler.pages.append(object())
+
+    crawler._run_queue = run_queue
+
+    first = await crawler.crawl()
+    second = await crawler.crawl()
+    await crawler.close()
+
+    assert runs == [(0, 0), (0, 0)]
+    assert first.total_crawled == 1
+    assert second.total_crawled == 1
+
+
+def test_enqueue_deduplicates_by_fingerprint():
+    """Test a URL is queued once and fingerprints are the only stored form."""
+    crawler = make_crawler()
+    queue = asyncio.PriorityQueue()
+
+    crawler._enqueue(queue, "https://example.com/a", 1)
+    crawler._enqueue(queue, "https://example.com/a", 2)
+    crawler._enqueue(queue, "https://example.com/b", 1)
+
+    assert queue.qsize() == 2
+    assert all(isinstance(fingerprint, bytes) for fingerprint in crawler._enqueued)
+    assert not hasattr(crawler, "visited_urls")
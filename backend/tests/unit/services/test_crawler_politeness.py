@@ -0,0 +1,115 @@
+"""Tests for crawler robots.txt handling and per-host throttling."""
+
+import pytest
+
+from app.services.crawler.fast_crawler import FastCrawler
+
+
+ROBOTS_TXT = """
+User-agent: *
+Disallow: /private/
+Crawl-delay: 5
+"""
+
+
+def make_crawler(**config) -> FastCrawler:
+    """Create a crawler whose robots.txt fetch is served from memory."""
+    crawler = FastCrawler({"start_url": "https://example.com/", **config})
+    fetched = []
+
+    async def fetch_robots_txt(robots_url):
+        fetched.append(robots_url)
+        return ROBOTS_TXT
+
+    crawler._fetch_robots_txt = fetch_robots_txt
+    crawler.fetched_robots = fetched
+    return crawler
+
+
+async def test_is_allowed_respects_robots_txt():
+    """Test disallowed paths are skipped and robots.txt is fetched once per host."""
+    crawler = make_crawler()
+
+    assert await crawler._is_allowed("https://example.com/blog") is True
+    assert await crawler._is_allowed("https://example.com/private/page") is False
+    assert crawler.fetched_robots == ["https://example.com/robots.txt"]
+
+
+async def test_is_allowed_ignores_robots_when_disabled():
+    """Test robots.txt is not fetched when respect_robots is off."""
+    crawler = make_crawler(respect_robots=False)
+
+    assert await crawler._is_allowed("https://example.com/private/page") is True
+    assert crawler.fetched_robots == []
+
+
+async def test_throttle_spaces_requests_per_host(monkeypatch):
+    """Test requests to one host are spaced while other hosts are not delayed."""
+    crawler = make_crawler(delay=0.5, respect_robots=False)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("app.services.crawler.base.asyncio.sleep", fake_sleep)
+
+    await crawler._throttle("https://example.com/a")
+    await crawler._throttle("https://example.com/b")
+    await crawler._throttle("https://other.com/")
+
+    assert len(sleeps) == 1
+    assert 0.4 < sleeps[0] <= 0.5
+
+
+async def test_throttle_uses_robots_crawl_delay(monkeypatch):
+    """Test a longer robots.txt Crawl-delay overrides the configured rate."""
+    crawler = make_crawler(delay=0.5)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("app.services.crawler.base.asyncio.sleep", fake_sleep)
+
+    await crawler._is_allowed("https://example.com/")
+    await crawler._throttle("https://example.com/a")
+    await crawler._throttle("https://example.com/b")
+
+    assert len(sleeps) == 1
+    assert sleeps[0] > 4
+
+
+def test_host_slots_are_per_host():
+    """Test each host gets its own concurrency limit."""
+    crawler = make_crawler(per_host=2)
+
+    first = crawler._host_slots("https://example.com/a")
+
+    assert crawler._host_slots("https://example.com/b") is first
+    assert crawler._host_slots("https://other.com/") is not first
+    assert first._value == 2
+
+
+async def test_fetch_page_throttles_every_retry(monkeypatch):
+    """Test retried fetches wait for a host slot on each attempt."""
+    crawler = make_crawler(respect_robots=False)
+    throttled = []
+
+    async def throttle(url):
+        throttled.append(url)
+
+    class FailingSession:
+        def get(self, url):
+            raise ConnectionError("boom")
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(FastCrawler._fetch_page.retry, "sleep", no_sleep)
+    crawler._throttle = throttle
+    crawler.session = FailingSession()
+
+    with pytest.raises(ConnectionError):
+        await crawler._fetch_page("https://example.com/a")
+
+    assert throttled == ["https://example.com/a"] * 3
@@ -0,0 +1,177 @@
+"""Tests for JSON-LD schema generation."""
+
+from types import SimpleNamespace
+
+from app.services import jsonld_generator as jsonld_generator_module
+from app.services.jsonld_generator import (
+    JSONLDGenerator,
+    _parsed_url,
+)
+from app.services.schema_detector import SchemaType
+
+
+def count_parses(monkeypatch):
+    """Record the HTML documents actually parsed for metadata."""
+    parsed = []
+    parse = jsonld_generator_module._parse_html_metadata
+    monkeypatch.setattr(
+        jsonld_generator_module, "_parse_html_metadata",
+        lambda base_url, html: parsed.append(html) or parse(base_url, html)
+    )
+    return parsed
+
+
+def make_page(url="https://example.com/blog/my-post", **fields):
+    """Create a minimal page-like object."""
+    defaults = {
+        "title": "My Post",
+        "meta_description": "A post",
+        "word_count": 800,
+        "html_content": None,
+        "created_at": None,
+        "updated_at": None,
+    }
+    return SimpleNamespace(url=url, **{**defaults, **fields})
+
+
+def test_parsed_url_derives_base_and_path():
+    """Test URL parsing exposes base URL and path segments."""
+    parsed = _parsed_url("https://example.com/a/b/?q=1")
+
+    assert parsed.base_url == "https://example.com"
+    assert parsed.path_parts == ("a", "b")
+    assert _parsed_url("https://example.com/a/b/?q=1") is parsed
+
+
+def test_breadcrumb_schema():
+    """Test breadcrumb items follow the URL path."""
+    schema = JSONLDGenerator().generate_schema(make_page(), SchemaType.BREADCRUMB_LIST)
+
+    items = schema["itemListElement"]
+    assert [item["item"] for item in items] == [
+        "https://example.com",
+        "https://example.com/blog",
+        "https://example.com/blog/my-post",
+    ]
+    assert items[2]["name"] == "My Post"
+
+
+def test_website_schema_default_search_action():
+    """Test WebSite schema points the search action at the site root."""
+    schema = JSONLDGenerator().generate_schema(make_page(), SchemaType.WEBSITE)
+
+    assert schema["@type"] == "WebSite"
+    assert schema["url"] == "https://example.com"
+    assert schema["potentialAction"]["target"] == "https://example.com/search?q={search_term_string}"
+
+
+ARTICLE_HTML = """
+<html>
+<head>
+    <meta property="og:image" content="/img/cover.png">
+    <meta name="twitter:image" content="https://cdn.example.com/card.png">
+    <meta property="article:author" content="Bob">
+    <meta name="author" content="Jane">
+    <meta property="article:published_time" content="2024-01-01T00:00:00Z">
+    <link rel="shortcut icon" href="/favicon.ico">
+</head>
+<body>
+    <nav><img src="/img/nav.png"></nav>
+    <article><h1>Title</h1><img src="/img/body.png"></article>
+</body>
+</html>
+"""
+
+
+def test_extract_metadata_from_html():
+    """Test article metadata is read from meta tags, the article body and icons."""
+    page = make_page(html_content=ARTICLE_HTML)
+
+    metadata = JSONLDGenerator()._extract_metadata_from_html(page)
+
+    assert metadata["images"] == [
+        "https://example.com/img/cover.png",
+        "https://cdn.example.com/card.png",
+        "https://example.com/img/body.png",
+    ]
+    assert metadata["author"] == "Jane"
+    assert metadata["published_date"] == "2024-01-01T00:00:00Z"
+    assert metadata["modified_date"] is None
+    assert metadata["logo"] == "https://example.com/favicon.ico"
+
+
+def test_extract_metadata_is_cached_per_html(monkeypatch):
+    """Test repeated extraction reuses the parse but returns independent copies."""
+    parsed = count_parses(monkeypatch)
+    generator = JSONLDGenerator()
+    page = make_page(html_content=ARTICLE_HTML + "<!-- cached -->")
+
+    first = generator._extract_metadata_from_html(page)
+    first["images"].append("https://example.com/extra.png")
+    second = generator._extract_metadata_from_html(page)
+
+    assert len(parsed) == 1
+    assert "https://example.com/extra.png" not in second["images"]
+
+
+def test_metadata_cache_is_bounded(monkeypatch):
+    """Test only the most recent pages stay cached, keyed by digest."""
+    monkeypatch.setattr(jsonld_generator_module, "METADATA_CACHE_SIZE", 2)
+    generator = JSONLDGenerator()
+
+    for i in range(3):
+        generator._extract_metadata_from_html(make_page(html_content=f"{ARTICLE_HTML}<!-- {i} -->"))
+
+    cache = jsonld_generator_module._metadata_cache
+    assert len(cache) == 2
+    assert all(isinstance(key[1], str) and len(key[1]) == 32 for key in cache)
+
+
+def test_article_schema_falls_back_to_one_timestamp():
+    """Test missing dates share the same generation timestamp."""
+    schema = JSONLDGenerator().generate_schema(make_page(), SchemaType.ARTICLE)
+
+    assert schema["datePublished"] == schema["dateModified"]
+    assert schema["author"] == {"@type": "Organization", "name": "example.com"}
+
+
+def test_article_schema_keeps_html_dates_when_overridden(monkeypatch):
+    """Test HTML is still read for dates when additional_data does not supply them."""
+    page = make_page(html_content=ARTICLE_HTML + "<!-- dates -->")
+    additional_data = {"author": "Ann", "image": "https://example.com/a.png", "publisher": {"name": "X"}}
+
+    schema = JSONLDGenerator().generate_schema(page, SchemaType.ARTICLE, additional_data)
+
+    assert schema["datePublished"] == "2024-01-01T00:00:00Z"
+    assert schema["author"] == {"@type": "Person", "name": "Ann"}
+    assert schema["image"] == "https://example.com/a.png"
+
+
+def test_article_schema_skips_html_when_overridden(monkeypatch):
+    """Test HTML is not parsed when additional_data supplies every article field."""
+    parsed = count_parses(monkeypatch)
+    page = make_page(html_content=ARTICLE_HTML + "<!-- unique -->")
+    additional_data = {
+        "author": "Ann",
+        "image": "https://example.com/a.png",
+        "publisher": {"name": "X"},
+        "date_published": "2023-05-01",
+        "date_modified": "2023-06-01",
+    }
+
+    schema = JSONLDGenerator().generate_schema(page, SchemaType.ARTICLE, additional_data)
+
+    assert parsed == []
+    assert schema["datePublished"] == "2023-05-01"
+    assert schema["dateModified"] == "2023-06-01"
+
+
+def test_format_for_html_keeps_unicode_and_indentation():
+    """Test the script tag holds indented JSON with non-ASCII text left as is."""
+    html = JSONLDGenerator().format_for_html({"@type": "Article", "headline": "Café"})
+
+    assert html == (
+        '<script type="application/ld+json">\n'
+        '{\n  "@type": "Article",\n  "headline": "Café"\n}\n'
+        '</script>'
+    )
@@ -0,0 +1,79 @@
+"""Tests for keyword extraction."""
+
+from app.services.keyword_extractor import KeywordExtractor
+
+
+TEXT = (
+    "Internal linking helps search engines. Good internal linking spreads authority, "
+    "and internal linking audits find orphan pages. Search engines follow links."
+)
+
+
+def test_extract_ngrams_fast_ranks_by_frequency():
+    """Test n-grams are counted and scored relative to the most frequent one."""
+    keywords = KeywordExtractor()._extract_ngrams_fast(TEXT, top_n=3, min_ngram=1, max_ngram=2)
+
+    assert keywords == [("internal", 1.0), ("linking", 1.0), ("internal linking", 1.0)]
+
+
+def test_extract_ngrams_fast_respects_ngram_range():
+    """Test only n-grams within the requested range are returned."""
+    keywords = KeywordExtractor()._extract_ngrams_fast(TEXT, top_n=10, min_ngram=2, max_ngram=2)
+
+    assert keywords[0] == ("internal linking", 1.0)
+    assert ("search engines", 0.6667) in keywords
+    assert all(len(k.split()) == 2 for k, _ in keywords)
+
+
+def test_extract_ngrams_fast_ignores_stopwords():
+    """Test stopwords and short tokens never produce keywords."""
+    assert KeywordExtractor()._extract_ngrams_fast("the and of to a in", 5, 1, 3) == []
+
+
+def test_extract_ngrams_fast_with_no_slots():
+    """Test a non-positive top_n returns no keywords."""
+    assert KeywordExtractor()._extract_ngrams_fast(TEXT, top_n=0, min_ngram=1, max_ngram=2) == []
+
+
+def test_extract_entities_keeps_first_occurrence_order():
+    """Test capitalized runs are returned deduplicated in document order."""
+    text = "Visit New York City and Paris, France. Apple Inc opened in New York City."
+
+    entities = KeywordExtractor().extract_entities(text)
+
+    assert entities == ["Visit New York City", "Paris", "France", "Apple Inc", "New York City"]
+
+
+def test_extract_entities_handles_non_latin1_capitals():
+    """Test capitalized words outside Latin-1 are recognized."""
+    text = "Wizyta w Łodzi i Świnoujściu, potem Čakovec oraz Москва сегодня."
+
+    entities = KeywordExtractor().extract_entities(text)
+
+    assert entities == ["Wizyta", "Łodzi", "Świnoujściu", "Čakovec", "Москва"]
+
+
+def test_clean_text_removes_urls_and_emails():
+    """Test URLs and emails are dropped and whitespace is collapsed."""
+    text = "  Read https://example.com/guide\nor write to team@example.com\t today "
+
+    assert KeywordExtractor()._clean_text(text) == "Read or write to today"
+
+
+def test_extract_keywords_uses_frequency_by_default():
+    """Test the default extractor needs no model and ranks by frequency."""
+    extractor = KeywordExtractor()
+
+    keywords = extractor.extract_keywords(TEXT, top_n=1, min_ngram=2, max_ngram=2)
+
+    assert extractor.kw_model is None
+    assert keywords == [("internal linking", 1.0)]
+
+
+def test_extract_entities_keeps_hyphenated_names():
+    """Test hyphenated proper nouns are kept as a single entity."""
+    text = "Jean-Pierre drinks Coca-Cola in Saint-Étienne with Al-Jazeera crews."
+
+    entities = KeywordExtractor().extract_entities(text)
+
+    assert entities == ["Jean-Pierre", "Coca-Cola", "Saint-Étienne", "Al-Jazeera"]
@@ -0,0 +1,143 @@
+"""Tests for internal linking graph analysis."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from app.services.graph import LinkGraphService
+from app.services.graph import link_graph
+
+
+def make_page(page_id, **fields):
+    """Create a minimal page-like object."""
+    defaults = {"url": f"https://example.com/{page_id}", "title": f"Page {page_id}", "word_count": 500}
+    return SimpleNamespace(id=page_id, **{**defaults, **fields})
+
+
+def make_link(source_id, target_id):
+    """Create a minimal link-like object."""
+    return SimpleNamespace(source_page_id=source_id, target_page_id=target_id)
+
+
+def test_page_importance_sums_to_one():
+    """Test PageRank scores form a distribution, including dangling pages."""
+    pages = [make_page(i) for i in range(1, 5)]
+    links = [make_link(1, 2), make_link(2, 3), make_link(3, 1), make_link(1, 4)]
+    service = LinkGraphService()
+
+    scores = service._compute_page_importance(service._graph_view(pages, links))
+
+    assert set(scores) == {1, 2, 3, 4}
+    assert sum(scores.values()) == pytest.approx(1.0)
+
+
+def test_page_importance_favors_linked_pages():
+    """Test a page linked from every other page gets the highest score."""
+    pages = [make_page(i) for i in range(1, 5)]
+    links = [make_link(2, 1), make_link(3, 1), make_link(4, 1), make_link(1, 2)]
+    service = LinkGraphService()
+
+    scores = service._compute_page_importance(service._graph_view(pages, links))
+
+    assert max(scores, key=scores.get) == 1
+    assert scores[3] == pytest.approx(scores[4])
+
+
+def test_recommendations_rank_by_similarity():
+    """Test recommendations exclude the source page and are sorted by similarity."""
+    pages = [
+        make_page(1, embedding=[1.0, 0.0]),
+        make_page(2, embedding=[0.8, 0.6]),
+        make_page(3, embedding=[0.6, 0.8]),
+        make_page(4, embedding=[0.0, 1.0]),
+    ]
+
+    recommendations = LinkGraphService().generate_recommendations(
+        pages, top_k=2, similarity_threshold=0.5
+    )
+
+    assert [r["target_page_id"] for r in recommendations[1]] == [2, 3]
+    assert [r["target_page_id"] for r in recommendations[2]] == [3, 1]
+    assert all(r["target_page_id"] != 4 for r in recommendations[1])
+
+
+def test_pack_embeddings_reuses_matrix():
+    """Test embeddings are packed normalized as float32 and reused for the same pages."""
+    service = LinkGraphService()
+    pages = [make_page(1, embedding=[3.0, 4.0]), make_page(2, embedding=[0.0, 2.0])]
+
+    packed = service._pack_embeddings(pages)
+
+    assert packed.dtype == np.float32
+    assert packed.shape == (2, 2)
+    assert np.allclose(np.linalg.norm(packed, axis=1), 1.0)
+    assert service._pack_embeddings(pages) is packed
+    assert service._pack_embeddings([pages[1], pages[0]]) is not packed
+
+
+def test_compute_metrics_counts_degrees():
+    """Test orphan, hub and outgoing counts from the shared adjacency build."""
+    pages = [make_page(i) for i in (10, 20, 30, 40)]
+    links = [make_link(10, 20), make_link(10, 30), make_link(10, 40), make_link(20, 30)]
+
+    metrics = LinkGraphService().compute_metrics(pages, links)
+
+    assert metrics["orphan_pages"] == 1
+    assert metrics["hub_pages"] == 1
+    assert metrics["max_incoming_links"] == 2
+    assert metrics["pages_with_no_outgoing"] == 2
+
+
+def test_analyze_combines_all_analyses():
+    """Test analyze returns metrics, importance and opportunities together."""
+    pages = [make_page(1), make_page(2), make_page(3, word_count=100)]
+    links = [make_link(1, 2), make_link(2, 1)]
+
+    result = LinkGraphService().analyze(pages, links)
+
+    assert result["metrics"]["orphan_pages"] == 1
+    assert set(result["page_importance"]) == {1, 2, 3}
+    assert [p["page_id"] for p in result["opportunities"]["orphan_pages"]] == [3]
+
+
+def test_find_missing_links_sorted_by_score():
+    """Test existing links are skipped and suggestions are sorted by score."""
+    recommendations = {
+        1: [{"target_page_id": 2, "similarity_score": 0.7}, {"target_page_id": 3, "similarity_score": 0.9}],
+        2: [{"target_page_id": 1, "similarity_score": 0.85}],
+    }
+
+    missing = LinkGraphService().find_missing_links([], [make_link(2, 1)], recommendations)
+
+    assert [(m["source_page_id"], m["target_page_id"]) for m in missing] == [(1, 3), (1, 2)]
+    assert [m["priority"] for m in missing] == ["high", "medium"]
+
+
+def test_recommendations_keep_duplicate_embeddings():
+    """Test self is excluded by index, so identical pages still recommend each other."""
+    pages = [
+        make_page(1, embedding=[1.0, 0.0]),
+        make_page(2, embedding=[1.0, 0.0]),
+        make_page(3, embedding=[0.8, 0.6]),
+    ]
+
+    recommendations = LinkGraphService().generate_recommendations(
+        pages, top_k=2, similarity_threshold=0.0
+    )
+
+    assert [r["target_page_id"] for r in recommendations[1]] == [2, 3]
+    assert [r["target_page_id"] for r in recommendations[2]] == [1, 3]
+
+
+def test_page_importance_without_scipy(monkeypatch):
+    """Test the numpy-only fallback matches the sparse matrix path."""
+    service = LinkGraphService()
+    pages = [make_page(i) for i in range(1, 6)]
+    links = [make_link(1, 2), make_link(2, 3), make_link(3, 1), make_link(1, 4), make_link(4, 3)]
+    view = service._graph_view(pages, links)
+
+    expected = service._compute_page_importance(view)
+    monkeypatch.setattr(link_graph, "sp", None)
+    scores = service._compute_page_importance(view)
+
+    assert scores == pytest.approx(expected)
@@ -0,0 +1,164 @@
+"""Tests for the CSR link graph service."""
+
+from types import SimpleNamespace
+
+import networkx as nx
+import pytest
+from app.services import link_graph as link_graph_module
+from app.services.link_graph import LinkGraphCSR, LinkGraphService
+
+
+class FakeRedis:
+    """In-memory stand-in for the sync Redis client."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    """Keep PageRank snapshots in memory."""
+    redis = FakeRedis()
+    monkeypatch.setattr(link_graph_module, "get_sync_redis", lambda: redis)
+    return redis
+
+
+EDGES = [(1, 2), (2, 3), (3, 1), (1, 4), (1, 5), (4, 3), (6, 1)]
+
+
+def make_graph(extra_edges=(), page_ids=range(1, 7)):
+    """Create a small graph with a cycle, a hub and a dangling page."""
+    return LinkGraphCSR.from_edges(list(page_ids), EDGES + list(extra_edges))
+
+
+def make_nx_graph(extra_edges=(), page_ids=range(1, 7)):
+    """Create the same graph with networkx, as a PageRank reference."""
+    G = nx.DiGraph()
+    G.add_nodes_from(page_ids)
+    G.add_edges_from(EDGES + list(extra_edges))
+    return G
+
+
+def test_calculate_pagerank_matches_networkx():
+    """Test the sparse power iteration agrees with nx.pagerank."""
+    ranks = LinkGraphService().calculate_pagerank(make_graph())
+
+    expected = nx.pagerank(make_nx_graph(), alpha=0.85)
+    assert ranks.keys() == expected.keys()
+    assert ranks == pytest.approx(expected, abs=1e-6)
+    assert sum(ranks.values()) == pytest.approx(1.0)
+
+
+def test_calculate_pagerank_empty_graph():
+    """Test an empty graph has no ranks."""
+    assert LinkGraphService().calculate_pagerank(LinkGraphCSR.from_edges([], [])) == {}
+
+
+def test_degree_rankings():
+    """Test orphans, hubs and authorities are read from the degree arrays."""
+    G = make_graph()
+    service = LinkGraphService()
+
+    assert service.find_orphan_pages(G) == [6]
+    assert service.find_hub_pages(G, top_n=2) == [(1, 3), (2, 1)]
+    assert service.find_authority_pages(G, {1: 0.5, 3: 0.3, 5: 0.3}, top_n=3) == [
+        (1, 0.5), (3, 0.3), (5, 0.3)
+    ]
+
+
+def test_project_pagerank_reused_until_links_change(monkeypatch):
+    """Test PageRank is recomputed only when the project's graph structure changes."""
+    service = LinkGraphService()
+    calls = []
+    compute = service.calculate_pagerank
+    monkeypatch.setattr(
+        service, "calculate_pagerank", lambda G, **kwargs: calls.append(G) or compute(G, **kwargs)
+    )
+
+    first = service.project_pagerank(1, make_graph())
+    assert service.project_pagerank(1, make_graph()) is first
+    assert len(calls) == 1
+
+    assert service.project_pagerank(1, make_graph([(5, 6)])) != first
+    assert len(calls) == 2
+
+
+def test_project_pagerank_cache_is_bounded(monkeypatch):
+    """Test only the most recently ranked projects stay in memory, keyed by digest."""
+    monkeypatch.setattr(link_graph_module, "PAGERANK_CACHE_SIZE", 2)
+    service = LinkGraphService()
+
+    for project_id in (1, 2, 3):
+        service.project_pagerank(project_id, make_graph())
+
+    assert list(service._pagerank_cache) == [2, 3]
+    assert service._pagerank_cache[3][0] == make_graph().structure_digest()
+
+
+def test_calculate_pagerank_warm_start_converges_to_same_ranks():
+    """Test starting from previous ranks gives the same result for the changed graph."""
+    service = LinkGraphService()
+    previous = service.calculate_pagerank(make_graph())
+    extra_edges = [(5, 6), (6, 7)]
+
+    ranks = service.calculate_pagerank(make_graph(extra_edges, range(1, 8)), initial=previous)
+
+    # Both stop once the total change drops below N * tol
+    expected = nx.pagerank(make_nx_graph(extra_edges, range(1, 8)), alpha=0.85)
+    assert ranks == pytest.approx(expected, abs=1e-5)
+
+
+class FakeQuery:
+    """Query stub returning fixed page rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *criteria):
+        return self
+
+    def yield_per(self, count):
+        return iter(self.rows)
+
+
+def test_build_graph_links_each_depth_to_the_next():
+    """Test synthetic edges go to the first five pages one level deeper."""
+    pages = [
+        SimpleNamespace(id=i, url=f"https://example.com/{i}", title=None, seo_score=None,
+                        depth=depth)
+        for i, depth in enumerate([0, 1, 1, 2, 1, 1, 1, 1, 5, 6], start=1)
+    ]
+    db = SimpleNamespace(query=lambda *columns: FakeQuery(pages))
+
+    graph = LinkGraphService().build_graph(db, project_id=1)
+    sources, targets = graph.edge_ids()
+    links = list(zip(sources.tolist(), targets.tolist()))
+
+    assert graph.page_ids.tolist() == list(range(1, 11))
+    assert [t for s, t in links if s == 1] == [2, 3, 5, 6, 7]
+    assert [t for s, t in links if s == 2] == [4]
+    assert [t for s, t in links if s == 9] == []
+    assert graph.num_links == 5 + 6
+    assert graph.titles[0] == ""
+
+
+def test_project_pagerank_warm_starts_from_shared_snapshot(monkeypatch):
+    """Test a new service instance starts from the ranks another worker saved."""
+    LinkGraphService().project_pagerank(1, make_graph())
+    service = LinkGraphService()
+    starts = []
+    compute = service.calculate_pagerank
+    monkeypatch.setattr(
+        service, "calculate_pagerank",
+        lambda G, initial=None: starts.append(initial) or compute(G, initial=initial)
+    )
+
+    service.project_pagerank(1, make_graph())
+
+    assert starts[0] == pytest.approx(LinkGraphService().calculate_pagerank(make_graph()))
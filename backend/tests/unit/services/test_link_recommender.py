@@ -0,0 +1,109 @@
+"""Tests for internal link recommendations."""
+
+from types import SimpleNamespace
+
+from app.services import link_recommender as link_recommender_module
+from app.services.link_recommender import LinkRecommender
+
+
+def make_page(page_id, text_content, **fields):
+    """Create a minimal page-like object."""
+    defaults = {
+        "url": f"https://example.com/{page_id}",
+        "title": None,
+        "h1": None,
+        "meta_description": None,
+        "seo_score": 0,
+        "depth": 1,
+        "rendered_html": None,
+        "content_hash": None,
+    }
+    return SimpleNamespace(id=page_id, text_content=text_content, **{**defaults, **fields})
+
+
+def test_find_matching_pages_scores_fields():
+    """Test title, H1, description and content matches add up, case-insensitively."""
+    recommender = LinkRecommender()
+    pages = [
+        make_page(1, "Nothing relevant here"),
+        make_page(2, "Internal Linking guide. internal linking tips", title="Internal Linking 101"),
+        make_page(3, "Internal linking once", h1="Internal linking", meta_description="About internal linking"),
+        make_page(4, None, title="Internal linking"),
+    ]
+
+    matches = recommender._find_matching_pages(
+        "Internal Linking", recommender._lowercase_targets(pages), pages[0]
+    )
+
+    assert [(page.id, round(score, 2)) for page, score in matches] == [(2, 0.7), (3, 0.6)]
+
+
+def test_lowered_text_reused_while_content_hash_matches(monkeypatch):
+    """Test target text is lowercased once per content hash and evicted oldest first by size."""
+    monkeypatch.setattr(link_recommender_module, "LOWERED_TEXT_CACHE_CHARS", 20)
+    recommender = LinkRecommender()
+    page = make_page(1, "Internal LINKING", content_hash="abc")
+
+    lowered = recommender._lowered_text(page)
+    assert recommender._lowered_text(make_page(1, "Internal LINKING", content_hash="abc")) is lowered
+    assert recommender._lowered_text(make_page(1, "New Text", content_hash="def")) == "new text"
+    assert list(recommender._lowered_texts) == [(1, "def")]
+    assert recommender._lowered_chars == len("new text")
+
+    # Texts larger than the whole budget are not cached
+    recommender._lowered_text(make_page(2, "x" * 21, content_hash="big"))
+    assert list(recommender._lowered_texts) == [(1, "def")]
+
+
+def test_find_keyword_positions_stops_at_limit():
+    """Test occurrences are found in order and the scan stops at the limit."""
+    text = "seo tips: seo audits and seo tools"
+
+    assert LinkRecommender()._find_keyword_positions(text, "SEO") == [0, 10, 25]
+    assert LinkRecommender()._find_keyword_positions(text, "SEO", limit=2) == [0, 10]
+
+
+class FakeQuery:
+    """Query stub returning the source page first and the targets for all()."""
+
+    def __init__(self, source, targets):
+        self.source = source
+        self.targets = targets
+
+    def options(self, *options):
+        return self
+
+    def filter(self, *criteria):
+        return self
+
+    def first(self):
+        return self.source
+
+    def all(self):
+        return self.targets
+
+
+def test_get_recommendations_links_keywords_to_matching_pages():
+    """Test suggestions point source keyword occurrences at pages about them."""
+    source = make_page(1, "Internal linking matters. Plan internal linking early. Linking helps.")
+    target = make_page(2, "A guide to internal linking", title="Internal linking guide")
+    db = SimpleNamespace(query=lambda model: FakeQuery(source, [target]))
+
+    suggestions = LinkRecommender().get_recommendations(db, page_id=1, project_id=1)
+
+    assert suggestions
+    assert {s.target_page_id for s in suggestions} == {2}
+    assert all(source.text_content.lower().find(s.keyword, s.position) == s.position for s in suggestions)
+    assert [s.score for s in suggestions] == sorted((s.score for s in suggestions), reverse=True)
+
+
+def test_has_nearby_link_uses_tag_positions():
+    """Test a link counts as nearby only when a whole tag lies within the radius."""
+    recommender = LinkRecommender()
+    html = "x" * 200 + '<a href="/a">A</a>' + "x" * 200
+    anchor_tags = recommender._anchor_tags(make_page(1, "text", rendered_html=html))
+
+    assert recommender._has_nearby_link(anchor_tags, 150)
+    assert recommender._has_nearby_link(anchor_tags, 300)
+    assert not recommender._has_nearby_link(anchor_tags, 98)
+    assert not recommender._has_nearby_link(anchor_tags, 450)
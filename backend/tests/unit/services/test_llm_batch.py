@@ -0,0 +1,54 @@
+"""Tests for concurrent LLM batch generation."""
+
+import asyncio
+
+import pytest
+from app.services.llm.base import BaseLLMAdapter, LLMException, LLMProvider
+
+
+class EchoAdapter(BaseLLMAdapter):
+    """Adapter stub answering each prompt after a short delay."""
+
+    def __init__(self):
+        super().__init__(api_key="test_key")
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _get_provider(self):
+        return LLMProvider.OPENAI
+
+    async def generate(self, messages, config=None):
+        raise NotImplementedError
+
+    async def generate_text(self, prompt, system_prompt=None, config=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Later prompts finish first, so ordering comes from the task list
+        await asyncio.sleep(0.01 / (len(prompt) + 1))
+        self.in_flight -= 1
+        if prompt == "fail":
+            raise LLMException("boom", provider="openai")
+        return f"{system_prompt}:{prompt}"
+
+    async def count_tokens(self, text, model=None):
+        return len(text) // 4
+
+    def get_models(self):
+        return []
+
+
+def test_generate_batch_keeps_prompt_order_and_limits_concurrency():
+    """Test results follow prompt order and at most `concurrency` calls run at once."""
+    adapter = EchoAdapter()
+    prompts = ["a" * i for i in range(1, 7)]
+
+    results = asyncio.run(adapter.generate_batch(prompts, system_prompt="s", concurrency=3))
+
+    assert results == [f"s:{p}" for p in prompts]
+    assert adapter.max_in_flight == 3
+
+
+def test_generate_batch_propagates_errors():
+    """Test a failed generation is raised from the batch as an LLMException."""
+    with pytest.raises(LLMException, match="boom"):
+        asyncio.run(EchoAdapter().generate_batch(["ok", "fail"]))
@@ -1,5 +1,7 @@
 """Tests for LLM factory."""
 
+from types import SimpleNamespace
+
 import pytest
 from app.services.llm import LLMFactory, LLMProvider
 from app.services.llm.openai_adapter import OpenAIAdapter
@@ -57,3 +59,51 @@ def test_get_provider_models():
     # HuggingFace
     models = LLMFactory.get_provider_models("huggingface")
     assert any("mistral" in m.lower() for m in models)
+
+
+def test_create_reuses_cached_adapter():
+    """Test that adapters are memoized per provider and API key."""
+    first = LLMFactory.create(provider="openai", api_key="cache_key")
+    second = LLMFactory.create(provider="OpenAI", api_key="cache_key")
+    other = LLMFactory.create(provider="openai", api_key="other_key")
+
+    assert first is second
+    assert first is not other
+
+    # Custom config bypasses the cache
+    configured = LLMFactory.create(provider="openai", api_key="cache_key", config={"x": 1})
+    assert configured is not first
+
+
+async def test_count_tokens_falls_back_when_encoding_fails(monkeypatch):
+    """Test a failed tiktoken load falls back to the character estimate."""
+    from app.services.llm import openai_adapter
+
+    def fail(*args):
+        raise OSError("no network")
+
+    monkeypatch.setattr(openai_adapter, "tiktoken", SimpleNamespace(encoding_for_model=fail, get_encoding=fail))
+    openai_adapter._encoder.cache_clear()
+    adapter = LLMFactory.create(provider="openai", api_key="tokens_key")
+
+    assert await adapter.count_tokens("a" * 40) == 10
+    openai_adapter._encoder.cache_clear()
+
+
+async def test_count_tokens_uses_the_requested_model(monkeypatch):
+    """Test the encoding follows the model of the call, not the adapter default."""
+    from app.services.llm import openai_adapter
+
+    requested = []
+
+    def encoding_for_model(model):
+        requested.append(model)
+        return SimpleNamespace(encode=lambda text, disallowed_special=(): text.split())
+
+    monkeypatch.setattr(openai_adapter, "tiktoken", SimpleNamespace(encoding_for_model=encoding_for_model))
+    openai_adapter._encoder.cache_clear()
+    adapter = LLMFactory.create(provider="openai", api_key="model_tokens_key")
+
+    assert await adapter.count_tokens("one two three", model="gpt-4o") == 3
+    assert requested == ["gpt-4o"]
+    openai_adapter._encoder.cache_clear()
@@ -0,0 +1,49 @@
+"""Tests for LLM token bucket rate limiter."""
+
+import pytest
+from app.services.llm.rate_limiter import TokenBucket, get_token_bucket
+
+
+@pytest.mark.asyncio
+async def test_acquire_within_budget():
+    """Test acquiring capacity when the bucket is full."""
+    bucket = TokenBucket(rpm=60, tpm=1000)
+
+    await bucket.acquire(tokens_estimate=400)
+    await bucket.acquire(tokens_estimate=400)
+
+    assert bucket._requests < 59
+    assert bucket._tokens < 201
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_refill(monkeypatch):
+    """Test that acquire sleeps when the token budget is exhausted."""
+    bucket = TokenBucket(rpm=60, tpm=600)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        # Simulate time passing by refilling the bucket
+        bucket._tokens = bucket.tpm
+
+    monkeypatch.setattr("app.services.llm.rate_limiter.asyncio.sleep", fake_sleep)
+
+    await bucket.acquire(tokens_estimate=600)
+    await bucket.acquire(tokens_estimate=300)
+
+    assert len(sleeps) == 1
+    assert sleeps[0] > 0
+
+
+def test_invalid_limits():
+    """Test that non-positive limits are rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(rpm=0, tpm=100)
+
+
+def test_get_token_bucket_is_shared():
+    """Test that buckets are shared per provider."""
+    assert get_token_bucket("openai", rpm=10, tpm=100) is get_token_bucket(
+        "openai", rpm=10, tpm=100
+    )